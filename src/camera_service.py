@@ -1,16 +1,34 @@
 import asyncio
+import concurrent.futures
 from enum import Enum
-import json
+import logging
+import random
+import socket
 import threading
 import time
-from dacite import from_dict
+import numpy as np
+import orjson
 import paho.mqtt.client as mqtt
-from dataclasses import asdict
 from cameras.camera_device import CameraDevice
 from config import *
 
+_log = logging.getLogger(__name__)
+
 
 class CameraService:
+    # Command dispatch tables: most commands just set a flag attribute on the
+    # camera, "connect" calls a method
+    _CMD_CALLS = {
+        "connect": "connect_cmd",
+    }
+    _CMD_FLAGS = {
+        "disconnect": "disconnect_command",
+        "start_stream": "start_streaming_command",
+        "stop_stream": "stop_streaming_command",
+        "start_record": "start_recording_command",
+        "stop_record": "stop_recording_command",
+    }
+
     def __init__(self, mqtt_host: str, mqtt_port: int, cameras: dict[int, CameraDevice]):
         """
         cameras: dict[int, CameraDevice]
@@ -20,10 +38,12 @@ class CameraService:
         self.cameras: dict[int, CameraDevice] = cameras
         # add status callback to cameras
         self.device_cfg = DeviceCfg()
-        self.vis_sts = VisSts()
+        # One comprehension, one allocation, final length: slot 0 is the
+        # dummy, slots 1..N belong to the cameras
+        self.vis_sts = VisSts(
+            cameraStates=[CameraStatus() for _ in range(len(self.cameras) + 1)])
         self.vis_cfg = VisCfg()
         self.vis_sts.cfg = self.vis_cfg
-        self.vis_sts.cameraStates.append(CameraStatus()) # dummy for index 0
         self.device_data = Device()
         self.device_data.cfg = self.device_cfg
         self.device_data.sts = self.vis_sts
@@ -31,24 +51,74 @@ class CameraService:
 
 
         for cam in self.cameras.values():
-            self.vis_sts.cameraStates.append(CameraStatus())
             cam.state_callback = self.camera_state_callback
 
-
-        # MQTT client
-        self.client = mqtt.Client()
+        # Per-camera dirty bits; "did any camera change" is a C-level any()
+        self._cam_dirty = np.zeros(len(self.cameras) + 1, dtype=bool)
+
+
+        # MQTT client: persistent session so reconnects skip re-SUBSCRIBE
+        self.client = mqtt.Client(
+            client_id=f"camsvc-{socket.gethostname()}",
+            clean_session=False,
+            callback_api_version=mqtt.CallbackAPIVersion.VERSION2,
+        )
+        self.client.reconnect_delay_set(min_delay=1, max_delay=30)
+        # Plenty of in-flight headroom for any remaining QoS 1 traffic, and no
+        # cap on the outbound queue
+        self.client.max_inflight_messages_set(100)
+        self.client.max_queued_messages_set(0)
         self.mqtt_is_connected = False
         self.is_connecting_to_mqtt = False
+        # Our own exponential backoff for re-issuing connect() from the state
+        # machine; jittered so multiple services don't storm the broker together
+        self._reconnect_delay = 1.0
+        self._reconnect_allowed_at = 0.0
         self.client.on_connect = self._on_connect
         self.client.on_disconnect = self._on_disconnect
         self.client.on_message = self._on_message
         self.last_heartbate_update_ms = 0
         self.heartbeat_detected = False
 
+        # O(1) dispatch for inbound messages instead of per-topic string compares
+        self._topic_handlers = {
+            SubscriptionTopics.MACHINE_VIS_STATUS.value: self._handle_vis_status,
+            SubscriptionTopics.API_PLC_ACTION_REQ.value: self._handle_action_req,
+            SubscriptionTopics.API_HMI_ACTION_REQ.value: self._handle_action_req,
+        }
+
+        # Serialization caches: only re-run to_dict/json.dumps when something changed
+        self._sts_dirty = True
+        self._sts_json_cache = None
+        self._cfg_dirty = True
+        self._cfg_json_cache = None
+        self._bridge_dirty = True
+        self._bridge_json_cache = None
+        # Reused envelope dicts: only the two values change between publishes
+        self._bridge_envelope = {"timestamp": 0, "payload": None}
+        self._sts_envelope = {"timestamp": 0, "payload": self.vis_sts}
+        self._cfg_envelope = {"timestamp": 0, "payload": self.device_cfg}
+        # Suppress publishes of unchanged payloads, but still emit a keepalive
+        # every few seconds so subscribers can detect liveness
+        self._last_sts_publish_ms = 0
+        self._last_cfg_publish_ms = 0
+        # Single worker keeps publishes ordered while keeping the serialize
+        # work off the asyncio event loop
+        self._ser_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix='mqtt-ser')
+
         # Internal
         self._running = True
         self.device_topic = DEVICE_TOPIC
+        # Topics never change; build them once instead of per publish
+        self._bridge_topic = PublishTopics.UPDATE_DEVICE_DATA.value
+        self._sts_topic = PublishTopics.UPDATE_DEVICE_DATA.value + '/sts'
+        self._cfg_topic = PublishTopics.UPDATE_DEVICE_DATA.value + '/cfg'
+        self._heartbeat_timeout_ms = HEARTBEAT_TIMEOUT_MS
         self._mqtt_connect_event = threading.Event()
+        # Wakes run_state_machine on real events instead of a 1 ms poll
+        self._wake = asyncio.Event()
+        self._loop = None
 
         # Start Paho networking thread
         self.client.loop_start()
@@ -62,12 +132,12 @@ class CameraService:
         """Begin initial connection attempt; Paho will auto-reconnect."""
      
         if not self.mqtt_host.strip() or not self.mqtt_port:
-            print("[MQTT] ERROR: host is empty after cleanup → using localhost")
+            _log.error("[MQTT] host is empty after cleanup → using localhost")
             host = "localhost"
 
         if self._running:
             try:
-                print(f"[MQTT] Connecting to {self.mqtt_host}:{self.mqtt_port} ...")
+                _log.info("[MQTT] Connecting to %s:%s ...", self.mqtt_host, self.mqtt_port)
                 # self.client.on_connect = self._on_connect
                 # self.client.on_disconnect = self._on_disconnect
                 self.client.on_message = self._on_message
@@ -75,25 +145,42 @@ class CameraService:
                 self.is_connecting_to_mqtt = True
                 return
             except Exception as e:
-                print(f"[MQTT] Connect failed: {e}. Retrying in 1 sec...")
-                time.sleep(1)
-
-    def _on_connect(self, client, userdata, flags, rc):
-        print(f"[MQTT] Connected to broker")
-        for topic in SubscriptionTopics:
-            self.client.subscribe(topic.value)
-            print(f"[MQTT] Subscribed to topic:", topic.value)
-            
+                self._schedule_reconnect_backoff()
+                _log.error("[MQTT] Connect failed: %s. Retrying in %.0f sec...",
+                           e, self._reconnect_delay)
+
+    def _on_connect(self, client, userdata, flags, reason_code, properties):
+        _log.info("[MQTT] Connected to broker")
+        # One SUBSCRIBE packet for all topics
+        self.client.subscribe([(topic.value, 0) for topic in SubscriptionTopics])
+        _log.info("[MQTT] Subscribed to topics: %s", [topic.value for topic in SubscriptionTopics])
+
         self._mqtt_connect_event.set()
         self.mqtt_is_connected = True
         self.is_connecting_to_mqtt = False
+        self._reconnect_delay = 1.0
+        self._wake_state_machine()
     
 
-    def _on_disconnect(self, client, userdata, rc):
-        print(f"[MQTT] Disconnected (rc={rc}). Paho will auto-reconnect.")
+    def _on_disconnect(self, client, userdata, disconnect_flags, reason_code, properties):
+        _log.info("[MQTT] Disconnected (rc=%s). Paho will auto-reconnect.", reason_code)
         self.mqtt_is_connected = False
         self.is_connecting_to_mqtt = False
+        self._schedule_reconnect_backoff()
         self._mqtt_connect_event.clear()
+        self._wake_state_machine()
+
+    def _schedule_reconnect_backoff(self):
+        """Doubles the retry delay (capped at 128 s) and adds jitter."""
+        delay = self._reconnect_delay
+        self._reconnect_allowed_at = time.monotonic() + delay + random.uniform(0, delay * 0.25)
+        self._reconnect_delay = min(delay * 2, 128.0)
+
+    def _wake_state_machine(self):
+        """Thread-safe wake-up; Paho callbacks run on the networking thread."""
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._wake.set)
      
 
     # ----------------------------------------------------------------------
@@ -105,55 +192,50 @@ class CameraService:
         Payload example:
         { "cmd": "start_stream" }
         """
-        topic = msg.topic
-        #msg_payload = msg.payload.decode("utf-8")
+        handler = self._topic_handlers.get(msg.topic)
+        if handler is None:
+            return
         try:
-            msg = json.loads(msg.payload)
-            data = msg.get('payload')
-            if data is None:
-                print(f"[MQTT] Missing payload in message on topic {topic}")
-                return
-            #print(f"[MQTT] Received message on topic {topic}: {data}")
-            pass
-        except json.JSONDecodeError:
-            print(f"[MQTT] Bad JSON: {msg.payload}")
+            # orjson parses the payload bytes directly, no decode step
+            data = orjson.loads(msg.payload).get('payload')
+        except orjson.JSONDecodeError:
+            _log.warning("[MQTT] Bad JSON: %s", msg.payload)
             return
-        #payload = msg_payload.payload
-
-        if topic == SubscriptionTopics.MACHINE_VIS_STATUS.value:
-            # convert data to VisSts data class
-            if data is None:
-                print(f"[MQTT] Empty MACHINE_VIS_STATUS payload")
-                return
-            sts: VisSts = from_dict(data_class=VisSts, data=data)
-            self.vis_sts.iExtService.o = sts.iExtService.o
+        if data is None:
+            _log.warning("[MQTT] Missing payload in message on topic %s", msg.topic)
+            return
+        handler(data)
 
-            #print(f"[MQTT] Updated MACHINE_VIS_STATUS: heartbeatVal={self.vis_sts.iExtService.o.heartbeatVal}")
+    def _handle_vis_status(self, data: dict):
+        """Ingests the external machine status (heartbeat + step number)."""
+        # Read the fields we actually consume straight out of the nested dict;
+        # rebuilding the whole VisSts tree via dacite is pure overhead here.
+        try:
+            ext_o = data['iExtService']['o']
+            self.vis_sts.iExtService.o.heartbeatVal = ext_o['heartbeatVal']
+        except KeyError as e:
+            _log.warning("[MQTT] MACHINE_VIS_STATUS payload missing key: %s", e)
             return
+        self._wake_state_machine()
+        #print(f"[MQTT] Updated MACHINE_VIS_STATUS: heartbeatVal={self.vis_sts.iExtService.o.heartbeatVal}")
 
+    def _handle_action_req(self, data: dict):
+        """Handles action requests from the PLC/HMI API topics."""
         actionType = ""
 
         if actionType == "cmd":
             cmd = data.get("cmd")
             cam_id = data.get("params")[0] if "params" in data and len(data["params"]) > 0 else None
-            print(f"[MQTT] Command for camera {cam_id}: {cmd}")
-
-            # Map MQTT commands → CameraDevice commands
-            if cmd == "connect":
-                #cam_index_by_serial = get_camera_index_by_serial(cam.camera_serial)
-                self.cameras[cam_id].connect_cmd()
-            elif cmd == "disconnect":
-                self.cameras[cam_id].disconnect_command = True
-            elif cmd == "start_stream":
-                self.cameras[cam_id].start_streaming_command = True
-            elif cmd == "stop_stream":
-                self.cameras[cam_id].stop_streaming_command = True
-            elif cmd == "start_record":
-                self.cameras[cam_id].start_recording_command = True
-            elif cmd == "stop_record":
-                self.cameras[cam_id].stop_recording_command = True
+            if _log.isEnabledFor(logging.DEBUG):
+                _log.debug("[MQTT] Command for camera %s: %s", cam_id, cmd)
+
+            # Map MQTT commands → CameraDevice commands via O(1) table lookups
+            if cmd in self._CMD_CALLS:
+                getattr(self.cameras[cam_id], self._CMD_CALLS[cmd])()
+            elif cmd in self._CMD_FLAGS:
+                setattr(self.cameras[cam_id], self._CMD_FLAGS[cmd], True)
             else:
-                print(f"[MQTT] Unknown command: {cmd}")
+                _log.warning("[MQTT] Unknown command: %s", cmd)
 
     # ----------------------------------------------------------------------
     # PUBLISHING (used by CameraDevices)
@@ -166,26 +248,48 @@ class CameraService:
         """
         
         try:
+            # Pure memory write: the state machine tick publishes the
+            # coalesced snapshot, never this callback
             self.vis_sts.cameraStates[cam_index] = state
+            self._cam_dirty[cam_index] = True
+            self._wake.set()  # camera run-loops share our event loop
             #self.publish_vision_status()
         except Exception as e:
-            print(f"[MQTT] Failed to publish state: {e}")
+            _log.error("[MQTT] Failed to publish state: %s", e)
+
+    def set_cfg(self, field_name: str, value):
+        """Mutates device_cfg and invalidates its serialization cache.
+
+        The cfg envelope references device_cfg directly, so writing through
+        here is the only way a change actually reaches the wire — the cached
+        bytes are reused verbatim until the dirty flag is raised.
+        """
+        setattr(self.device_cfg, field_name, value)
+        self._cfg_dirty = True
+        self._bridge_dirty = True  # bridge payload embeds cfg too
 
     def set_new_step_num(self, step_num: int):
         """Sets a new step number for the device."""
         self.device_data.Is.stepNum = step_num
-        print(f"[SERVICE] stepNum: {step_num}")
+        self._sts_dirty = True
+        self._bridge_dirty = True
+        if _log.isEnabledFor(logging.DEBUG):
+            _log.debug("[SERVICE] stepNum: %s", step_num)
 
     async def run_state_machine(self):
         """Main service loop."""
-        print("[MQTT] Starting run_state_machine loop...")
+        _log.info("[MQTT] Starting run_state_machine loop...")
+        self._loop = asyncio.get_running_loop()
         last_publish_time_ms = 0
-
-        
+        last_hb_check_ms = 0
 
         while self._running :
-            timeNowMs = int(time.time() * 1000)
-            self.checkHeartbeat()
+            # One monotonic read per iteration, reused everywhere below
+            timeNowMs = time.monotonic_ns() // 1_000_000
+            # Heartbeat resolution doesn't need millisecond granularity
+            if timeNowMs - last_hb_check_ms >= 50:
+                last_hb_check_ms = timeNowMs
+                self.checkHeartbeat(timeNowMs)
             if self.device_data.Is.stepNum > int(DeviceStates.RESETTING) and not self.mqtt_is_connected:
                 self.set_new_step_num(int(DeviceStates.ABORTING))
 
@@ -200,7 +304,8 @@ class CameraService:
                 case int(DeviceStates.RESETTING):
                     if self.mqtt_is_connected:
                         self.set_new_step_num(int(DeviceStates.IDLE))
-                    elif not self.is_connecting_to_mqtt:
+                    elif not self.is_connecting_to_mqtt \
+                            and time.monotonic() >= self._reconnect_allowed_at:
                         self.connect_mqtt()
                         
 
@@ -208,33 +313,49 @@ class CameraService:
                     pass
                 case int(DeviceStates.RUNNING):
                     pass
-            if timeNowMs - last_publish_time_ms >= 1000:
+            # Publish on the 1 s tick, or early (but no sooner than
+            # STATUS_FLUSH_MS after the last publish) when state changed, so
+            # bursts of camera transitions coalesce into one message
+            elapsed_ms = timeNowMs - last_publish_time_ms
+            if elapsed_ms >= 1000 or (elapsed_ms >= STATUS_FLUSH_MS
+                                      and (self._sts_dirty or self._cam_dirty.any())):
                 last_publish_time_ms = timeNowMs
                 await self.publish_device_data()
 
-            await asyncio.sleep(0.001)  # publish every second
+            # Sleep until something happens (message/connect/disconnect) or the
+            # 1 s timeout fires for the periodic publish
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=1.0)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
 
-    def checkHeartbeat(self):   
+    def checkHeartbeat(self, timeNowMs: int):
         self.vis_sts.iExtService.i.stepNum = self.device_data.Is.stepNum
         if self.vis_sts.iExtService.i.heartbeatVal != self.vis_sts.iExtService.o.heartbeatVal:
             self.vis_sts.iExtService.i.heartbeatVal = self.vis_sts.iExtService.o.heartbeatVal
-            self.last_heartbate_update_ms = int(time.time() * 1000)
+            self._sts_dirty = True
+            self._bridge_dirty = True
+            self.last_heartbate_update_ms = timeNowMs
             if not self.heartbeat_detected:
-                print(f"[MQTT] Heartbeat detected.")
+                _log.info("[MQTT] Heartbeat detected.")
                 self.heartbeat_detected = True
                 self.set_new_step_num(int(DeviceStates.RUNNING))
             #print(f"[MQTT] Updated heartbeatVal to {self.vis_sts.iExtService.i.heartbeatVal}")
-        elif self.heartbeat_detected and int(time.time() * 1000) - self.last_heartbate_update_ms > HEARTBEAT_TIMEOUT_MS:
+        elif self.heartbeat_detected and timeNowMs - self.last_heartbate_update_ms > self._heartbeat_timeout_ms:
             if not self.heartbeat_detected:
-                print(f"[MQTT] Heartbeat timeout detected.")
+                _log.info("[MQTT] Heartbeat timeout detected.")
                 self.heartbeat_detected = True
                 self.set_new_step_num(int(DeviceStates.ABORTING))
 
     async def publish_device_data(self):
         """Publishes the overall vision status periodically."""
-        self.vis_sts.iExtService.i.stepNum = self.device_data.Is.stepNum
-        self.device_data.sts = self.vis_sts
-        self.device_data.cfg = self.device_cfg
+        # device_data.sts/cfg are bound once in __init__ and never change reference;
+        # checkHeartbeat keeps iExtService.i.stepNum current.
+        if self._cam_dirty.any():
+            self._cam_dirty[:] = False
+            self._sts_dirty = True
+            self._bridge_dirty = True
 
         if not self.mqtt_is_connected:
             return
@@ -245,73 +366,71 @@ class CameraService:
             #await self.publish_cfg()
 
         except Exception as e:
-            print(f"[MQTT] Error publishing vision status: {e}")
+            _log.error("[MQTT] Error publishing vision status: %s", e)
           
     async def publish_device_data_bridge_device_update(self):
-        """Broadcasts the device data to the bridge."""
-        base_topic = PublishTopics.UPDATE_DEVICE_DATA.value
-        
-        
-        device_dict = asdict(self.device_data)
-        # replace the 'Is' key with 'is' to match expected casing
-        device_dict['is'] = device_dict.pop('Is')
-        # need to replace any key or sub key that has 'List' with 'list' to match expected casing
-        device_dict['errors']['list'] = device_dict['errors'].pop('List')
-        device_dict['warnings']['list'] = device_dict['warnings'].pop('List')
-
-        #for each key in device_dict, add key to end of topic
-        for key in device_dict:
-            topic = f"{base_topic}/{key}".lower()
-            message_dict = {
-                "timestamp": int(time.time() * 1000),
-                "payload": device_dict[key] # This keeps the camera config as a nested dictionary, not a string
-            }
-            #Encode the *entire* dictionary to a single JSON string *once*
-            message_json = json.dumps(message_dict)
-            #print(f"Publishing DeviceData to {topic}: {message_json}")
-
-            # Publish the single, clean JSON string
-            self.client.publish(topic, message_json, qos=0)
+        """Broadcasts the device data to the bridge as a single MQTT message."""
+        topic = self._bridge_topic
+
+        if self._bridge_dirty or self._bridge_json_cache is None:
+            # to_dict already emits the bridge's casing ('is', 'list') via
+            # its alias table, so no key rewriting is needed here
+            device_dict = to_dict(self.device_data)
+
+            envelope = self._bridge_envelope
+            envelope["timestamp"] = int(time.time() * 1000)
+            envelope["payload"] = device_dict  # This keeps the whole device tree as nested dictionaries, not strings
+            self._bridge_json_cache = orjson.dumps(envelope)
+            self._bridge_dirty = False
+
+        # One publish for the whole device tree instead of one per top-level key
+        # Debug logs size only — the payload body never hits the formatter
+        _log.debug("[MQTT] Publishing DeviceData to %s (%d bytes)",
+                   topic, len(self._bridge_json_cache))
+        self.client.publish(topic, self._bridge_json_cache, qos=0)
 
     async def publish_cfg(self):
         #tag = "machine.devices[13].Cfg"
-        topic = PublishTopics.UPDATE_DEVICE_DATA.value + '/cfg'
-          # 1. Get the vis_cfg object as a standard Python dictionary
-        cfg_dict = asdict(self.device_cfg)
-
-        # 2. Build the final Python dictionary that has the "tag" and "value" keys
-        message_dict = {
-            "timestamp": int(time.time() * 1000),
-            "payload": cfg_dict # This keeps the camera config as a nested dictionary, not a string
-        }
-
-        # 3. Encode the *entire* dictionary to a single JSON string *once*
-        message_json = json.dumps(message_dict)
-        #print(f"Publishing Cfg to {topic}: {message_json}")
-
-        # 4. Publish the single, clean JSON string
-        self.client.publish(topic, message_json, qos=0)
+        timeNowMs = time.monotonic_ns() // 1_000_000
+        if not self._cfg_dirty and self._cfg_json_cache is not None \
+                and timeNowMs - self._last_cfg_publish_ms < KEEPALIVE_PUBLISH_MS:
+            # Unchanged payload and the keepalive window hasn't elapsed: skip
+            return
+        self._last_cfg_publish_ms = timeNowMs
+        await asyncio.get_running_loop().run_in_executor(
+            self._ser_executor, self._serialize_and_publish_cfg)
+
+    def _serialize_and_publish_cfg(self):
+        """Runs on the serializer thread: re-dumps cfg if dirty, then publishes."""
+        if self._cfg_dirty or self._cfg_json_cache is None:
+            # orjson serializes the dataclass tree directly to bytes, no dict
+            # step; the envelope already references device_cfg
+            self._cfg_envelope["timestamp"] = int(time.time() * 1000)
+            self._cfg_json_cache = orjson.dumps(self._cfg_envelope)
+            self._cfg_dirty = False
+        self.client.publish(self._cfg_topic, self._cfg_json_cache, qos=0)
 
     async def publish_vision_status(self):
         #tag = "machine.visSts"
-        topic = PublishTopics.UPDATE_DEVICE_DATA.value + '/sts'
-            # 1. Get the vis_sts object as a standard Python dictionary
-        vis_sts_dict = asdict(self.vis_sts)
-        #print(f"[MQTT] Publishing vision status with heartbeatVal={vis_sts_dict['iExtService']['i']['heartbeatVal']}")
-        #print(f"[MQTT] step number: {vis_sts_dict['iExtService']['i']['stepNum']}")
-
-        # 2. Build the final Python dictionary that has the "tag" and "value" keys
-        message_dict = {
-            "timestamp": int(time.time() * 1000),
-            "payload": vis_sts_dict # This keeps the camera config as a nested dictionary, not a string
-        }
-
-        # 3. Encode the *entire* dictionary to a single JSON string *once*
-        message_json = json.dumps(message_dict)
-        #print(f"Publishing Sts to {topic}: {message_json}")
-
-        # 4. Publish the single, clean JSON string
-        self.client.publish(topic, message_json, qos=1)
+        timeNowMs = time.monotonic_ns() // 1_000_000
+        if not self._sts_dirty and self._sts_json_cache is not None \
+                and timeNowMs - self._last_sts_publish_ms < KEEPALIVE_PUBLISH_MS:
+            # Unchanged payload and the keepalive window hasn't elapsed: skip
+            return
+        self._last_sts_publish_ms = timeNowMs
+        await asyncio.get_running_loop().run_in_executor(
+            self._ser_executor, self._serialize_and_publish_sts)
+
+    def _serialize_and_publish_sts(self):
+        """Runs on the serializer thread: re-dumps sts if dirty, then publishes."""
+        if self._sts_dirty or self._sts_json_cache is None:
+            # orjson serializes the dataclass tree directly to bytes, no dict
+            # step; the envelope already references vis_sts
+            self._sts_envelope["timestamp"] = int(time.time() * 1000)
+            self._sts_json_cache = orjson.dumps(self._sts_envelope)
+            self._sts_dirty = False
+        # Publish fire-and-forget: next second's snapshot supersedes this one
+        self.client.publish(self._sts_topic, self._sts_json_cache, qos=0)
 
 
     # ----------------------------------------------------------------------
@@ -325,7 +444,7 @@ class CameraService:
         # while not self._mqtt_connect_event.is_set():
         #     await asyncio.sleep(0.1)
 
-        print("[MQTT] Service started. MQTT connected.")
+        _log.info("[MQTT] Service started. MQTT connected.")
 
         # create thread for mqtt connect and handling
         #mqtt_task = asyncio.create_task(self.connect_mqtt())
@@ -348,13 +467,14 @@ class CameraService:
 
     def shutdown(self):
         """Shuts down the service and its components."""
-        print("[SERVICE] Shutting down...")
+        _log.info("[SERVICE] Shutting down...")
         self.is_connecting_to_mqtt = False
+        self._ser_executor.shutdown(wait=False)
         self.shutdown_mqtt()
 
 
     def shutdown_mqtt(self):
-        print("[MQTT] Shutting down...")
+        _log.info("[MQTT] Shutting down...")
         
         try:
             self.client.loop_stop()
@@ -363,19 +483,13 @@ class CameraService:
             pass
 
 
+def _json_default(obj):
+    """Fallback encoder for values orjson doesn't handle natively (Enums)."""
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj)} is not JSON serializable")
+
+
 def serialize_to_json(data_object) -> str:
     """Converts a dataclass object to a JSON string."""
-    
-    # asdict() does the heavy lifting of converting the object to a dictionary.
-    data_dict = asdict(data_object)
-    
-    # We still need a custom encoder to handle the Enum conversion automatically.
-    # The default json.dumps won't know how to handle Enums in the dict.
-    class EnumEncoder(json.JSONEncoder):
-        def default(self, obj):
-            if isinstance(obj, Enum):
-                return obj.value
-            return json.JSONEncoder.default(self, obj)
-
-    json_payload = json.dumps(data_dict, indent=4, cls=EnumEncoder)
-    return json_payload
\ No newline at end of file
+    return orjson.dumps(data_object, option=orjson.OPT_INDENT_2, default=_json_default).decode()
\ No newline at end of file
@@ -5,28 +5,47 @@ camera_service.py
 Combined single-file camera service:
 - captures from a camera via OpenCV
 - serves an MJPEG stream at /stream
-- records video to disk in a background thread via a bounded queue
+- records video to disk in a background thread via a preallocated frame ring
 - supports keyboard controls for local testing
 - provides diagnostic logging
 """
 
 import asyncio
 from enum import IntEnum
+import shutil
+import subprocess
 import threading
 import time
 import sys
 import select
 import termios
 import tty
-import queue
 from aiohttp import web, client_exceptions
 import cv2
+import numpy as np
 import os
 from typing import Optional
 from dataclasses import dataclass
 from cameras.camera_names import get_camera_index_by_serial
 from cameras.types import *
 
+# Optional SIMD JPEG encoder (libjpeg-turbo); cv2.imencode is the fallback
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _turbo_jpeg = TurboJPEG()
+except Exception:
+    _turbo_jpeg = None
+
+# Route the stream downscale through OpenCL (UMat) when a device is present.
+# TurboJPEG needs host ndarrays, so the UMat path only pairs with imencode.
+_use_opencl = False
+try:
+    if cv2.ocl.haveOpenCL():
+        cv2.ocl.setUseOpenCL(True)
+        _use_opencl = cv2.ocl.useOpenCL()
+except Exception:
+    pass
+
 # -----------------------
 # Configuration
 # -----------------------
@@ -38,16 +57,22 @@ CAPTURE_HEIGHT = 1080
 
 # Recording settings
 RECORD_FOURCC = cv2.VideoWriter_fourcc(*"mp4v")
-REC_QUEUE_MAXSIZE = 12              # bounded queue for frames to record (drop when full)
+FFMPEG_BIN = shutil.which("ffmpeg")  # preferred recording sink; cv2.VideoWriter fallback
+REC_RING_SLOTS = 12                 # preallocated frame slots for the recorder ring
 
 # Streaming settings (lighter than recording)
 STREAM_TARGET_WIDTH = 1280
+STREAM_TARGET_HEIGHT = 720
 STREAM_JPEG_QUALITY = 60            # 0-100
 STREAM_FPS = 20.0                   # target FPS for MJPEG streaming (lower than capture)
 
 # Server
 STREAM_PORT = 8000
 
+# Multipart framing, assembled once instead of per frame
+MJPEG_FRAME_HEADER = b"--frame\r\nContent-Type: image/jpeg\r\n\r\n"
+MJPEG_FRAME_FOOTER = b"\r\n"
+
 # Diagnostic interval (s)
 DIAG_INTERVAL = 1.0
 
@@ -78,9 +103,18 @@ class CameraDevice:
 
         
 
-        # Shared frame buffer & lock
+        # Shared frame buffer: updated by plain reference assignment (atomic
+        # under the GIL), with a sequence counter so readers can detect new
+        # frames without a lock
         self.current_frame = None
-        self.frame_lock = asyncio.Lock()
+        self._frame_seq = 0
+        # Two reusable decode targets for retrieve(): alternating keeps the
+        # previously published frame intact while the next one is written
+        self._rd_bufs: list = [None, None]
+        self._rd_idx = 0
+        # Fully framed multipart part (header+JPEG+footer) built once per
+        # frame in the capture thread and fanned out to every client
+        self._latest_part: Optional[bytes] = None
 
         # Commands (used by keyboard or external control)
         self.start_recording_command = False
@@ -90,20 +124,35 @@ class CameraDevice:
         self.connect_command = False
         self.disconnect_command = False
 
-        # Recording queue & worker
-        self.rec_queue: "queue.Queue" = queue.Queue(maxsize=REC_QUEUE_MAXSIZE)
+        # Capture thread: blocking grab()/retrieve() runs here so the asyncio
+        # loop stays free for HTTP writes and the state machine
+        self._capture_thread: Optional[threading.Thread] = None
+        self._capture_running = False
+        self._capture_failed = False
+        self._frame_event = asyncio.Event()
+        # One Event per connected stream client; a single capture notifies all
+        self._stream_events: set[asyncio.Event] = set()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Recording ring: preallocated frame slots written in place by the
+        # capture thread (single producer) and drained by the record worker
+        # (single consumer) — no per-frame allocation in the hot path
+        self._rec_ring: list = []
+        self._rec_ring_head = 0
+        self._rec_ring_tail = 0
+        self._rec_ring_fill = threading.Semaphore(0)
+        self._rec_ring_lock = threading.Lock()  # guards tail for the drop-oldest path
         self._rec_thread: Optional[threading.Thread] = None
         self._rec_running = threading.Event()
         self._recording_filename = OUTPUT_FILENAME
 
         # Stats
-        self.stats = {
-            "captured": 0,
-            "stream_sent": 0,
-            "record_written": 0,
-            "dropped_for_rec": 0,
-            "last_diag": time.time(),
-        }
+        # Stats: plain int attributes — no dict hashing on the frame path
+        self._captured = 0
+        self._stream_sent = 0
+        self._record_written = 0
+        self._dropped_for_rec = 0
+        self._last_diag = time.time()
 
         # aiohttp app
         self.app = web.Application()
@@ -128,9 +177,23 @@ class CameraDevice:
     async def open_capture(self):
         """Open the camera device and apply requested settings."""
         try:
-            # Use V4L2 backend on Linux if available for better behavior:
-            # self.cap = cv2.VideoCapture(self.camera_index, cv2.CAP_V4L2)
-            self.cap = cv2.VideoCapture(self.camera_index)
+            # Ask the backend for hardware-accelerated MJPEG decode
+            # (VAAPI/D3D11/MFX, whatever the OpenCV build supports — needs an
+            # FFmpeg built WITH_VA plus libva/intel-media-driver on Intel).
+            # Falls back to plain CPU decode if the accelerated open fails.
+            self.cap = cv2.VideoCapture(
+                self.camera_index,
+                cv2.CAP_V4L2,
+                [cv2.CAP_PROP_HW_ACCELERATION, cv2.VIDEO_ACCELERATION_ANY,
+                 cv2.CAP_PROP_HW_DEVICE, 0],
+            )
+            if not self.cap.isOpened():
+                print(f"[cam{self.id}] HW-accelerated open failed; falling back to default backend")
+                self.cap.release()
+                self.cap = cv2.VideoCapture(self.camera_index)
+            # Keep only one frame in the V4L2 driver queue so read() always
+            # returns the newest frame (default of 4 adds ~130 ms at 30 FPS)
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
             # Try to set MJPG first (reduces CPU usage)
             fourcc_mjpg = cv2.VideoWriter_fourcc(*"MJPG")
             self.cap.set(cv2.CAP_PROP_FOURCC, fourcc_mjpg)
@@ -153,6 +216,9 @@ class CameraDevice:
             actual_w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
             actual_h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
             print(f"[cam{self.id}] Opened. Actual resolution: {actual_w}x{actual_h} @ {actual_fps} FPS (requested {REQUESTED_FPS})")
+            # Drain anything already queued by the driver so the first read
+            # isn't a stale frame
+            self.cap.grab()
             self.state.isConnected = True
             return True
 
@@ -167,6 +233,8 @@ class CameraDevice:
     async def close_capture(self):
         """Close capture and cleanup."""
         self.state.isConnected = False
+        self._stop_capture_thread()
+        self._capture_failed = False
         if self.cap:
             try:
                 self.cap.release()
@@ -174,28 +242,201 @@ class CameraDevice:
                 pass
             self.cap = None
 
+    # -----------------------
+    # Capture worker (thread)
+    # -----------------------
+    def _set_capture_resolution(self, width, height):
+        """Ask the camera itself to emit this resolution.
+
+        A UVC webcam can't dual-stream two sizes, but while only /stream is
+        active we can run the sensor at stream resolution so the CPU never
+        scales a 1080p frame. The capture thread is paused around the mode
+        switch since cap.set() isn't safe concurrent with grab().
+        """
+        if not self.cap or not self.state.isConnected:
+            return
+        if int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)) == width:
+            return
+        restart = self._capture_running
+        if restart:
+            self._stop_capture_thread()
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        self.cap.grab()  # flush one frame at the old geometry
+        if restart:
+            self._start_capture_thread()
+
+    def _start_capture_thread(self):
+        if self._capture_thread and self._capture_thread.is_alive():
+            return
+        self._capture_running = True
+        self._capture_failed = False
+        self._capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._capture_thread.start()
+
+    def _stop_capture_thread(self, join_timeout=1.0):
+        self._capture_running = False
+        if self._capture_thread:
+            self._capture_thread.join(timeout=join_timeout)
+            self._capture_thread = None
+
+    def _capture_loop(self):
+        """Background thread: keeps the blocking grab()/retrieve() calls off
+        the asyncio event loop and publishes frames by reference swap."""
+        while self._capture_running and self.cap is not None:
+            try:
+                ret = self.cap.grab()
+            except Exception as e:
+                print(f"[cam{self.id}] Capture read exception: {e}")
+                ret = False
+            if not ret:
+                self._capture_failed = True
+                self._notify_frame()
+                return
+            self._captured += 1
+            need_frame = (self.state.isStreaming
+                          or self.state.recordingState == CameraRecordingState.RECORDING)
+            if not need_frame:
+                continue
+            # Decode into a preallocated buffer; cv2 only reallocates when
+            # the frame geometry changes (e.g. the stream-resolution switch)
+            idx = self._rd_idx
+            ret, frame = self.cap.retrieve(self._rd_bufs[idx])
+            if not ret:
+                continue
+            self._rd_bufs[idx] = frame
+            self._rd_idx = idx ^ 1
+            self.current_frame = frame
+            self._frame_seq += 1
+            if self.state.isStreaming and self._stream_events:
+                # Downscale + encode once here; clients only write bytes
+                h, w = frame.shape[:2]
+                if w > STREAM_TARGET_WIDTH:
+                    scale = STREAM_TARGET_WIDTH / w
+                    src = cv2.UMat(frame) if (_use_opencl and _turbo_jpeg is None) else frame
+                    small = cv2.resize(src, (int(w * scale), int(h * scale)),
+                                       interpolation=cv2.INTER_LINEAR)
+                else:
+                    small = frame
+                if _turbo_jpeg is not None:
+                    payload = _turbo_jpeg.encode(
+                        small, quality=STREAM_JPEG_QUALITY, pixel_format=TJPF_BGR)
+                else:
+                    ok, jpeg = cv2.imencode(".jpg", small,
+                                            [int(cv2.IMWRITE_JPEG_QUALITY), STREAM_JPEG_QUALITY])
+                    # join() reads the ndarray through the buffer protocol, so
+                    # there's no intermediate tobytes() copy
+                    payload = memoryview(jpeg) if ok else None
+                if payload is not None:
+                    self._latest_part = b"".join(
+                        (MJPEG_FRAME_HEADER, payload, MJPEG_FRAME_FOOTER))
+            if self.state.recordingState == CameraRecordingState.RECORDING:
+                self._rec_ring_put(frame)
+            self._notify_frame()
+
+    def _rec_ring_put(self, frame):
+        """Copy a frame into the next free ring slot; drop when full."""
+        ring = self._rec_ring
+        if not ring or ring[0].shape != frame.shape:
+            # Allocate the slots once, sized to the actual frame geometry
+            ring = [np.empty_like(frame) for _ in range(REC_RING_SLOTS)]
+            self._rec_ring = ring
+        head = self._rec_ring_head
+        nxt = (head + 1) % len(ring)
+        if nxt == self._rec_ring_tail:
+            # Ring full: under a writer stall, keep the newest frames and
+            # drop the oldest queued one so the recording stays near-live
+            if self._rec_ring_fill.acquire(blocking=False):
+                with self._rec_ring_lock:
+                    self._rec_ring_tail = (self._rec_ring_tail + 1) % len(ring)
+                self._dropped_for_rec += 1
+            if nxt == self._rec_ring_tail:
+                # consumer raced us and the ring is somehow still full
+                self._dropped_for_rec += 1
+                return
+        np.copyto(ring[head], frame)
+        self._rec_ring_head = nxt
+        self._rec_ring_fill.release()
+
+    def _notify_frame(self):
+        """Thread-safe wake-up of the async side after a new frame lands."""
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._set_frame_events)
+
+    def _set_frame_events(self):
+        """Runs on the event loop: wakes the run loop and every stream client."""
+        self._frame_event.set()
+        for ev in self._stream_events:
+            ev.set()
+
     # -----------------------
     # Recording worker (thread)
     # -----------------------
+    def _open_ffmpeg_sink(self, filename, fps, frame_size):
+        """Spawn an ffmpeg child taking raw BGR frames on stdin, or None."""
+        if not FFMPEG_BIN:
+            return None
+        w, h = frame_size
+        try:
+            return subprocess.Popen(
+                [FFMPEG_BIN, "-f", "rawvideo", "-pix_fmt", "bgr24",
+                 "-s", f"{w}x{h}", "-r", str(fps), "-i", "pipe:0",
+                 "-c:v", "libx264", "-preset", "veryfast", "-y", filename],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                bufsize=1 << 20,
+            )
+        except Exception as e:
+            print(f"[cam{self.id}] ffmpeg sink unavailable ({e}); using VideoWriter")
+            return None
+
     def _rec_worker(self, filename, fourcc, fps, frame_size):
-        """Background thread: consume frames from rec_queue and write via VideoWriter."""
+        """Background thread: drain the frame ring into the recording sink.
+
+        Prefers piping raw frames to an ffmpeg child (one large buffered
+        write per frame, proper encoder); falls back to cv2.VideoWriter.
+        """
         try:
-            writer = cv2.VideoWriter(filename, fourcc, fps, frame_size)
-            if not writer.isOpened():
-                print(f"[cam{self.id}] Record worker: VideoWriter failed to open {filename}")
-                return
+            proc = self._open_ffmpeg_sink(filename, fps, frame_size)
+            writer = None
+            if proc is None:
+                writer = cv2.VideoWriter(filename, fourcc, fps, frame_size)
+                if not writer.isOpened():
+                    print(f"[cam{self.id}] Record worker: VideoWriter failed to open {filename}")
+                    return
             print(f"[cam{self.id}] Record worker started (writing to {filename})")
-            while self._rec_running.is_set() or not self.rec_queue.empty():
-                try:
-                    frame = self.rec_queue.get(timeout=0.1)
-                except queue.Empty:
+            scratch = None  # private copy of the claimed slot
+            while self._rec_running.is_set() or self._rec_ring_tail != self._rec_ring_head:
+                if not self._rec_ring_fill.acquire(timeout=0.1):
                     continue
+                # Copy the slot out before releasing it: once tail advances
+                # the producer treats the slot as free (and the drop-oldest
+                # path may skip past it during a stall), so writing the sink
+                # straight from the ring could emit a torn frame while
+                # ffmpeg's pipe is blocked
+                with self._rec_ring_lock:
+                    tail = self._rec_ring_tail
+                    src = self._rec_ring[tail]
+                    if scratch is None or scratch.shape != src.shape:
+                        scratch = np.empty_like(src)
+                    np.copyto(scratch, src)
+                    self._rec_ring_tail = (tail + 1) % len(self._rec_ring)
                 try:
-                    writer.write(frame)
-                    self.stats["record_written"] += 1
+                    if proc is not None:
+                        # ndarray supports the buffer protocol: no tobytes copy
+                        proc.stdin.write(scratch)
+                    else:
+                        writer.write(scratch)
+                    self._record_written += 1
                 except Exception as e:
                     print(f"[cam{self.id}] Error writing frame in record worker: {e}")
-            writer.release()
+            if proc is not None:
+                proc.stdin.close()
+                proc.wait(timeout=10)
+            else:
+                writer.release()
             print(f"[cam{self.id}] Record worker stopped, file finalized.")
         except Exception as e:
             print(f"[cam{self.id}] Record worker crashed: {e}")
@@ -213,6 +454,10 @@ class CameraDevice:
         frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         frame_rate = max(1.0, float(self.cap.get(cv2.CAP_PROP_FPS) or REQUESTED_FPS))
         frame_size = (frame_width, frame_height)
+        # Fresh ring state per recording session
+        self._rec_ring_head = 0
+        self._rec_ring_tail = 0
+        self._rec_ring_fill = threading.Semaphore(0)
         self._rec_running.set()
         self._rec_thread = threading.Thread(
             target=self._rec_worker,
@@ -264,43 +509,32 @@ class CameraDevice:
         )
         await response.prepare(request)
 
+        last_seq = -1
+        # Event-driven: the capture thread wakes every registered client on
+        # each new frame, so there is no polling quantum in the latency path
+        new_frame = asyncio.Event()
+        self._stream_events.add(new_frame)
         try:
             while self.state.isStreaming and self.state.isConnected:
-                # Grab latest frame quickly
-                frame = None
+                # Timeout only so the loop condition is re-checked if the
+                # stream is stopped while no frames arrive
                 try:
-                    # Acquire lock but don't block long
-                    await asyncio.wait_for(self.frame_lock.acquire(), timeout=0.01)
-                    if self.current_frame is not None:
-                        frame = self.current_frame.copy()
-                    self.frame_lock.release()
+                    await asyncio.wait_for(new_frame.wait(), timeout=0.5)
                 except asyncio.TimeoutError:
-                    # skip this tick if lock busy
-                    await asyncio.sleep(0.01)
                     continue
-
-                if frame is None:
-                    await asyncio.sleep(0.01)
-                    continue
-
-                # Downscale if necessary for streaming
-                h, w = frame.shape[:2]
-                if w > STREAM_TARGET_WIDTH:
-                    scale = STREAM_TARGET_WIDTH / w
-                    frame = cv2.resize(frame, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_LINEAR)
-
-                # Encode JPEG at lower quality for stream
-                ret, jpeg = cv2.imencode(".jpg", frame, [int(cv2.IMWRITE_JPEG_QUALITY), STREAM_JPEG_QUALITY])
-                if not ret:
-                    await asyncio.sleep(0.01)
+                new_frame.clear()
+                # The capture thread already downscaled, encoded and framed
+                # this part; every client shares the same bytes
+                part = self._latest_part
+                seq = self._frame_seq
+                if part is None or seq == last_seq:
                     continue
+                last_seq = seq
 
                 try:
-                    await response.write(b"--frame\r\n")
-                    await response.write(b"Content-Type: image/jpeg\r\n\r\n")
-                    await response.write(jpeg.tobytes())
-                    await response.write(b"\r\n")
-                    self.stats["stream_sent"] += 1
+                    # One write per frame, zero per-client assembly
+                    await response.write(part)
+                    self._stream_sent += 1
                 except (client_exceptions.ClientConnectionResetError, BrokenPipeError):
                     # Client disconnected
                     break
@@ -311,6 +545,7 @@ class CameraDevice:
                 # Aim for streaming FPS
                 await asyncio.sleep(max(0, 1.0 / STREAM_FPS))
         finally:
+            self._stream_events.discard(new_frame)
             try:
                 await response.write_eof()
             except Exception:
@@ -348,6 +583,7 @@ class CameraDevice:
         print(f"[cam{self.id}] Entering main run loop. Press 'c' to connect, 'r' to record, 't' to stream, 'q' to quit.")
 
         lastUpdateTimeMs = time.time() * 1000
+        self._loop = asyncio.get_running_loop()
 
         try:
             while True:
@@ -359,7 +595,8 @@ class CameraDevice:
                 # Handle connect/disconnect commands
                 if (self.connect_command or self.auto_connect) and not self.state.isConnected:
                     self.connect_command = False
-                    await self.open_capture()
+                    if await self.open_capture():
+                        self._start_capture_thread()
 
                 if self.disconnect_command and self.state.isConnected:
                     self.disconnect_command = False
@@ -367,47 +604,38 @@ class CameraDevice:
                     # ensure recorder is stopped
                     if self.state.recordingState == CameraRecordingState.RECORDING:
                         self.state.recordingState = CameraRecordingState.SAVING
-                # If connected, read frames
-                if self.state.isConnected and self.cap:
-                    # Read frame (this blocks until next frame)
-                    try:
-                        ret, frame = self.cap.read()
-                    except Exception as e:
-                        print(f"[cam{self.id}] Capture read exception: {e}")
-                        await self.close_capture()
-                        await asyncio.sleep(0.1)
-                        continue
-
-                    if not ret:
-                        # failed to grab frame -> try to reconnect
-                        print(f"[cam{self.id}] Failed to read frame; disconnecting.")
-                        await self.close_capture()
-                        await asyncio.sleep(0.5)
-                        self.state.isConnected = False
-                        continue
-
-                    # Update stats & shared buffer
-                    self.stats["captured"] += 1
-                    async with self.frame_lock:
-                        self.current_frame = frame.copy()
 
+                # Capture thread hit a read failure -> try to reconnect
+                if self._capture_failed and self.state.isConnected:
+                    print(f"[cam{self.id}] Failed to read frame; disconnecting.")
+                    await self.close_capture()
+                    await asyncio.sleep(0.5)
+
+                if self.state.isConnected:
                     # Handle start/stop streaming commands (state machine)
                     if self.start_streaming_command or self.auto_start_stream:
                         self.start_streaming_command = False
                         if not self.state.isStreaming:
                             self.state.isStreaming = True
+                            if self.state.recordingState == CameraRecordingState.STOPPED:
+                                self._set_capture_resolution(STREAM_TARGET_WIDTH, STREAM_TARGET_HEIGHT)
                             print(f"[cam{self.id}] Streaming enabled on /stream")
 
                     if self.stop_streaming_command:
                         self.stop_streaming_command = False
                         if self.state.isStreaming:
                             self.state.isStreaming = False
+                            if self.state.recordingState == CameraRecordingState.STOPPED:
+                                self._set_capture_resolution(CAPTURE_WIDTH, CAPTURE_HEIGHT)
                             print(f"[cam{self.id}] Streaming disabled")
 
-                    # Handle recording commands & queue frames for recorder
+                    # Handle recording commands; the capture thread enqueues
+                    # frames while recordingState is RECORDING
                     if self.state.recordingState == CameraRecordingState.STOPPED:
                         if self.start_recording_command:
                             self.start_recording_command = False
+                            # Recording always gets the full capture resolution
+                            self._set_capture_resolution(CAPTURE_WIDTH, CAPTURE_HEIGHT)
                             # Initialize recorder worker
                             started = self.start_record_worker()
                             if started:
@@ -420,12 +648,6 @@ class CameraDevice:
                             self.stop_recording_command = False
                             self.state.recordingState = CameraRecordingState.SAVING
                             print(f"[cam{self.id}] Stopping recording, finalizing file...")
-                        else:
-                            # enqueue frame non-blocking; drop if full
-                            try:
-                                self.rec_queue.put_nowait(frame.copy())
-                            except queue.Full:
-                                self.stats["dropped_for_rec"] += 1
 
                     elif self.state.recordingState == CameraRecordingState.SAVING:
                         # finalize recording: stop worker and transition to stopped
@@ -433,8 +655,13 @@ class CameraDevice:
                         self.state.recordingState = CameraRecordingState.STOPPED
                         print(f"[cam{self.id}] Recording saved and worker stopped.")
 
-                # Tiny sleep to yield to event loop (do not make this large)
-                await asyncio.sleep(0.0005)
+                # Sleep until the capture thread signals a frame or the 100 ms
+                # command tick elapses — no busy polling
+                try:
+                    await asyncio.wait_for(self._frame_event.wait(), timeout=0.1)
+                except asyncio.TimeoutError:
+                    pass
+                self._frame_event.clear()
 
         except asyncio.CancelledError:
             # expected on shutdown
@@ -457,14 +684,16 @@ class CameraDevice:
     async def _log_stats(self):
         while False:
             now = time.time()
-            if now - self.stats["last_diag"] >= DIAG_INTERVAL:
+            if now - self._last_diag >= DIAG_INTERVAL:
                 print(
                     f"[cam{self.id}] stats (last {DIAG_INTERVAL}s): "
-                    f"captured={self.stats['captured']} stream_sent={self.stats['stream_sent']} "
-                    f"written={self.stats['record_written']} dropped_rec={self.stats['dropped_for_rec']}"
+                    f"captured={self._captured} stream_sent={self._stream_sent} "
+                    f"written={self._record_written} dropped_rec={self._dropped_for_rec}"
                 )
                 # reset counters for interval
-                self.stats.update(captured=0, stream_sent=0, record_written=0, dropped_for_rec=0, last_diag=now)
+                self._captured = self._stream_sent = 0
+                self._record_written = self._dropped_for_rec = 0
+                self._last_diag = now
             await asyncio.sleep(0.2)
 
 # -----------------------
@@ -1,8 +1,11 @@
 import asyncio
 from aiohttp import web, client_exceptions
 import cv2
+import numpy as np
+import os
+import queue
+import threading
 import sys
-import select
 import termios
 import tty
 
@@ -23,21 +26,80 @@ frames_per_second = 30.0
 # but we write the *output file* using the mp4v codec for standard playback compatibility.
 fourcc_codec = cv2.VideoWriter_fourcc(*'mp4v') 
 
+# Cap OpenCV's internal pool to half the cores so imencode/resize don't
+# oversubscribe against the capture thread and aiohttp
+cv2.setNumThreads(max(1, (os.cpu_count() or 2) // 2))
+
+# Run resize/encode through OpenCL (UMat) when a device is available
+_use_opencl = False
+try:
+    if cv2.ocl.haveOpenCL():
+        cv2.ocl.setUseOpenCL(True)
+        _use_opencl = cv2.ocl.useOpenCL()
+except Exception:
+    pass
+
+# Multipart framing built once; Content-Length lets clients parse parts faster
+MJPEG_PART_HEADER = b"--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n"
+MJPEG_PART_FOOTER = b"\r\n"
+
+# Encode parameters as immutable singletons — no per-frame list allocation
+JPEG_ENC_PARAMS = (cv2.IMWRITE_JPEG_QUALITY, 85)
+JPEG_ENC_PARAMS_SMALL = (cv2.IMWRITE_JPEG_QUALITY, 80)
+
 # i need a camera_device class that connects to a camera index, streams video frames and starts and stops recording also while streaming
 class CameraDevice:    
-    def __init__(self, camera_index, status_callback: callable):
+    # Command-name -> flag attribute consumed by the state handlers
+    _CMD_ATTRS = {
+        'connect': 'connect_command',
+        'disconnect': 'disconnect_command',
+        'start_recording': 'start_recording_command',
+        'stop_recording': 'stop_recording_command',
+        'start_streaming': 'start_streaming_command',
+        'stop_streaming': 'stop_streaming_command',
+    }
+
+    def __init__(self, camera_index, status_callback: callable, serve_http: bool = True):
         self.camera_index = camera_index
+        # When a manager serves all cameras from one shared app, it passes
+        # serve_http=False and routes /stream/<idx> to mjpeg_handler itself
+        self.serve_http = serve_http
+        self.stream_port = 8000
         self.is_connected = False
         self.state = "disconnected"  # Possible values: "disconnected", "connected"
         self.recording_state = "stopped"  # Possible values: "stopped", "recording", "saving", "disconnected"
         self.streaming_state = "stopped"  # Possible values: "stopped", "streaming", "disconnected"
         self.recording_task = None
         self.streaming_task = None
+        # Encode thread state: VideoWriter.write is a software encode and
+        # must never run on the event loop
+        self._rec_q = None
+        self._rec_thread = None
+        self._rec_running = False
+        self._dropped = 0
         self.cap = None
         self.video_writer = None
         self.status_callback = status_callback
         self.current_frame = None  # Shared frame buffer for streaming and recording
-        self.frame_lock = asyncio.Lock()  # Protect frame access
+        # Pool of preallocated frame buffers rotated by read_camera; readers
+        # snapshot current_frame by reference (atomic under the GIL), so no
+        # lock and no per-frame copy are needed
+        self._frame_pool = []
+        self._latest_idx = 0
+        # Capture thread: blocking cv2 reads happen off the event loop
+        self._capture_thread = None
+        self._capture_running = False
+        self._capture_failed = False
+        self._frame_event = asyncio.Event()
+        self._loop = None
+        # JPEGs encoded once per frame in the capture thread; all stream
+        # clients share the same bytes. Preview clients get the low-res
+        # stream unless they ask for ?q=high
+        self._latest_jpeg = None
+        self._latest_jpeg_small = None
+        # One wakeup event per connected client; also doubles as the client
+        # count so the capture thread can skip encoding when nobody watches
+        self._clients = set()
 
         # requests 
         self.start_recording_command = False
@@ -47,6 +109,15 @@ class CameraDevice:
         self.connect_command = False
         self.disconnect_command = False
 
+        # Commands arrive through this queue; run() blocks on it while idle
+        # instead of spinning on the flags
+        self._cmd_q = asyncio.Queue()
+
+        # Status updates flow through one long-lived pump task, so a
+        # flapping camera can't pile up fire-and-forget callback tasks
+        self._status_q = asyncio.Queue()
+        self._status_task = None
+
 
 
     async def setup_streaming_server(self):
@@ -59,32 +130,55 @@ class CameraDevice:
         await site.start()
         #print(f"Camera {self.device_id} streaming on port {self.stream_port}/stream")
 
+    def _dispatch_command(self, cmd):
+        """Maps a queued command name onto its request flag."""
+        flag = self._CMD_ATTRS.get(cmd)
+        if flag:
+            setattr(self, flag, True)
+
+    async def _status_pump(self):
+        """Single consumer for status updates: one callback in flight at a
+        time, naturally back-pressured by the queue."""
+        while True:
+            idx, msg = await self._status_q.get()
+            await self.status_callback(idx, msg)
+
     async def run(self):
         """Main state machine for the camera device lifecycle."""
         previous_state = ""
-        await self.setup_streaming_server()
+        if self.serve_http:
+            await self.setup_streaming_server()
+        self._status_task = asyncio.create_task(self._status_pump())
         while True:
             if self.state != previous_state:
                 previous_state = self.state
-                asyncio.create_task(self.status_callback(self.camera_index, f"Camera {self.camera_index} state changed to: {self.state}"))
+                self._status_q.put_nowait(
+                    (self.camera_index, f"Camera {self.camera_index} state changed to: {self.state}"))
             match self.state:
                 case "disconnected":
                     if self.is_connected:
                         await self.handle_disconnected()
                         #print(f"Camera {self.camera_index} disconnected.")
+                    # Block on the command queue while idle — zero busy-wait
+                    try:
+                        cmd = await asyncio.wait_for(self._cmd_q.get(), timeout=0.5)
+                    except asyncio.TimeoutError:
+                        cmd = None
+                    if cmd:
+                        self._dispatch_command(cmd)
                     if self.connect_command:
                         await self.handle_connect()
                         self.connect_command = False  # Reset connect command after attempting
                 case "connected":
+                    # Frames drive the pace; drain any pending commands first
+                    while not self._cmd_q.empty():
+                        self._dispatch_command(self._cmd_q.get_nowait())
                     if self.disconnect_command:
                         await self.handle_disconnected()
                         self.disconnect_command = False  # Reset disconnect command after attempting
                     else:
                         await self.read_camera()
 
-
-            await asyncio.sleep(0.00001)  # Small delay to prevent tight loop
-
     async def handle_connect(self):
         """Attempts to connect to the camera index using openCV."""
         try:
@@ -103,6 +197,10 @@ class CameraDevice:
                 self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 1080)
                 self.cap.set(cv2.CAP_PROP_FPS, frames_per_second)
 
+                # Keep the V4L2 driver queue at a single frame so reads always
+                # return the newest frame instead of ~4 frames of latency
+                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
                 # Report actual settings used by the hardware
                 actual_fps = self.cap.get(cv2.CAP_PROP_FPS)
                 actual_width = self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)
@@ -110,6 +208,13 @@ class CameraDevice:
                 print(f"Camera {self.camera_index} connected.")
                 print(f"Actual Resolution: {actual_width}x{actual_height} at {actual_fps} FPS (via MJPG)")
                 print("Press 'r' (record start), 'f' (record stop), 't' (stream start), 'y' (stream stop) in terminal.")
+
+                # Blocking reads run in their own thread from here on
+                self._loop = asyncio.get_running_loop()
+                self._capture_running = True
+                self._capture_failed = False
+                self._capture_thread = threading.Thread(target=self._capture_worker, daemon=True)
+                self._capture_thread.start()
                 
             else:
                 self.cap.release()
@@ -124,41 +229,92 @@ class CameraDevice:
         self.is_connected = False
         self.state = "disconnected"
         if self.video_writer is not None:
+            self._stop_rec_thread()
             self.video_writer.release()
             self.video_writer = None
+
+        # Stop and join the capture thread before touching cap: releasing a
+        # capture while the worker is blocked in grab()/read() can crash
+        # natively
+        self._capture_running = False
+        if self._capture_thread:
+            self._capture_thread.join(timeout=1.0)
+            self._capture_thread = None
         if self.cap:
             self.cap.release()
 
         self.recording_state = "disconnected"
         self.streaming_state = "disconnected"
       
-    async def read_camera(self):
-        """The main loop for reading frames and processing commands."""
-      
-        try:
-            # Read frame blocks until a frame is ready
-            ret, frame = self.cap.read()
-            if not ret:
-                print(f"Failed to read frame from camera {self.camera_index}")
-                await self.handle_disconnected()
-                return
+    def _capture_worker(self):
+        """Capture thread: blocking grab/retrieve and the single shared JPEG
+        encode both run here, off the event loop."""
+        while self._capture_running:
+            try:
+                pool = self._frame_pool
+                if pool:
+                    # grab() advances past any stale buffered frame without
+                    # paying its decode; retrieve() decodes only the newest
+                    # one into the next preallocated slot
+                    idx = (self._latest_idx + 1) % len(pool)
+                    self.cap.grab()
+                    ret, frame = self.cap.retrieve(pool[idx])
+                else:
+                    # First frame defines the geometry; build the pool from it
+                    idx = 0
+                    ret, frame = self.cap.read()
+                    if ret:
+                        self._frame_pool = pool = [frame, np.empty_like(frame), np.empty_like(frame)]
+                if not ret:
+                    self._capture_failed = True
+                    break
+            except Exception:
+                self._capture_failed = True
+                break
+
+            # Publish by reference swap — no copy, no lock
+            pool[idx] = frame  # cv2 only reallocates the slot on geometry change
+            self._latest_idx = idx
+            self.current_frame = frame
+
+            # Encode once per frame for every client, and only while someone
+            # is actually connected and the stream is enabled
+            if self._clients and self.streaming_state == "streaming":
+                src = cv2.UMat(frame) if _use_opencl else frame
+                ok, jpeg = cv2.imencode('.jpg', src, JPEG_ENC_PARAMS)
+                if ok:
+                    self._latest_jpeg = jpeg.tobytes()
+                small = cv2.resize(src, (800, 600), interpolation=cv2.INTER_AREA)
+                ok, jpeg = cv2.imencode('.jpg', small, JPEG_ENC_PARAMS_SMALL)
+                if ok:
+                    self._latest_jpeg_small = jpeg.tobytes()
+
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._on_new_frame)
+
+    def _on_new_frame(self):
+        """Runs on the event loop: wakes the state machine and all clients."""
+        self._frame_event.set()
+        for ev in self._clients:
+            ev.set()
 
-        except Exception as e:
-            print(f"Error during main loop from camera {self.camera_index}: {e}")
+    async def read_camera(self):
+        """Waits for the capture thread to publish a frame, then runs the
+        streaming/recording state handlers against it."""
+        if self._capture_failed:
+            print(f"Failed to read frame from camera {self.camera_index}")
             await self.handle_disconnected()
             return
-
-        # Store frame in shared buffer for HTTP streaming to access
-        async with self.frame_lock:
-            self.current_frame = frame.copy()  # Copy to avoid race conditions
-             
-        await asyncio.gather(
-            self.handle_streaming_display(),
-            self.handle_video_recording(frame)
-        )
-        # This needs to run faster than a simple sleep to process frames immediately
-        # yield control back to the async event loop without sleeping for a specific duration
-        await asyncio.sleep(0.0001) 
+        try:
+            await asyncio.wait_for(self._frame_event.wait(), timeout=0.5)
+            self._frame_event.clear()
+        except asyncio.TimeoutError:
+            pass  # no frame yet; still service pending commands
+
+        await self.handle_streaming_display()
+        frame = self.current_frame
+        if frame is not None:
+            await self.handle_video_recording(frame)
                 
     async def handle_streaming_display(self):
         # STREAMING (DISPLAY) LOGIC - just manages state
@@ -196,12 +352,16 @@ class CameraDevice:
                         # Use the actual FPS the camera provides
                         frame_rate = self.cap.get(cv2.CAP_PROP_FPS) 
                         
-                        self.video_writer = cv2.VideoWriter(output_filename, fourcc_codec, frame_rate, frame_size)
+                        self.video_writer = self._open_video_writer(output_filename, frame_rate, frame_size)
 
                         if not self.video_writer.isOpened():
                              print(f"Error: VideoWriter could not open file {output_filename}. Check codec/permissions.")
                              self.recording_state = "stopped"
                         else:
+                            self._rec_q = queue.Queue(maxsize=60)
+                            self._rec_running = True
+                            self._rec_thread = threading.Thread(target=self._rec_worker, daemon=True)
+                            self._rec_thread.start()
                             self.recording_state = "recording"
                             print(f"Recording started to {output_filename} for camera {self.camera_index}")
 
@@ -213,12 +373,18 @@ class CameraDevice:
                         print(f"Saving and finalizing recording for camera {self.camera_index}")
 
                     else:
-                        # write frame to video file
+                        # hand the frame to the encode thread; drop on overflow.
+                        # Copy because the frame is a rotating pool slot that
+                        # the capture thread will overwrite
                         if self.video_writer is not None:
-                            self.video_writer.write(frame)
+                            try:
+                                self._rec_q.put_nowait(frame.copy())
+                            except queue.Full:
+                                self._dropped += 1
 
                 case "saving":
                     # Finalize the file and transition back to stopped state
+                    self._stop_rec_thread()
                     if self.video_writer is not None:
                         self.video_writer.release()
                         self.video_writer = None
@@ -227,6 +393,7 @@ class CameraDevice:
 
         except Exception as e:
             print(f"Error during video recording from camera {self.camera_index}: {e}")
+            self._stop_rec_thread()
             if self.video_writer is not None:
                  self.video_writer.release()
                  self.video_writer = None
@@ -237,6 +404,45 @@ class CameraDevice:
         self.start_recording_command = False
         self.stop_recording_command = False
 
+    def _open_video_writer(self, filename, frame_rate, frame_size):
+        """Prefers a hardware H.264 GStreamer pipeline; falls back to mp4v.
+
+        v4l2h264enc covers Pi-class devices; on builds without GStreamer (or
+        without the encoder element) isOpened() is false and the software
+        mp4v writer is used as before.
+        """
+        pipeline = (
+            "appsrc ! videoconvert ! v4l2h264enc ! h264parse ! mp4mux "
+            f"! filesink location={filename}"
+        )
+        try:
+            writer = cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0, frame_rate, frame_size)
+            if writer.isOpened():
+                print(f"Recording via hardware H.264 (GStreamer) for camera {self.camera_index}")
+                return writer
+        except Exception:
+            pass
+        return cv2.VideoWriter(filename, fourcc_codec, frame_rate, frame_size)
+
+    def _rec_worker(self):
+        """Encode thread: drains queued frames into the VideoWriter."""
+        while self._rec_running or (self._rec_q is not None and not self._rec_q.empty()):
+            try:
+                frame = self._rec_q.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            try:
+                self.video_writer.write(frame)
+            except Exception as e:
+                print(f"Error writing frame for camera {self.camera_index}: {e}")
+
+    def _stop_rec_thread(self, join_timeout=3.0):
+        """Lets the encode thread drain its queue, then joins it."""
+        self._rec_running = False
+        if self._rec_thread:
+            self._rec_thread.join(timeout=join_timeout)
+            self._rec_thread = None
+
     async def mjpeg_handler(self, request):
         """HTTP handler for MJPEG streaming - runs continuously per connected client."""
         if self.cap is None or not self.is_connected:
@@ -255,29 +461,33 @@ class CameraDevice:
         )
         await response.prepare(request)
 
+        # Full resolution only on request; previews default to the small feed
+        want_full = request.query.get('q', 'low') == 'high'
+
+        # Register for per-frame wakeups; the capture thread sets this event
+        # whenever a new JPEG is ready, so there is no pacing sleep at all —
+        # clients naturally track the capture FPS
+        client_event = asyncio.Event()
+        self._clients.add(client_event)
+
         try:
             while self.streaming_state == "streaming" and self.is_connected:
-                # Get the current frame from shared buffer
-                async with self.frame_lock:
-                    if self.current_frame is None:
-                        await asyncio.sleep(0.01)
-                        continue
-                    frame = self.current_frame.copy()
-                
-                # Encode frame as JPEG
-                ret, jpeg = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-                if not ret:
-                    await asyncio.sleep(0.01)
+                try:
+                    await asyncio.wait_for(client_event.wait(), timeout=0.5)
+                except asyncio.TimeoutError:
+                    continue  # re-check stream/connection state
+                client_event.clear()
+
+                # The capture thread already encoded this frame once for
+                # everyone; just pick the resolution the client asked for
+                jpeg_bytes = self._latest_jpeg if want_full else self._latest_jpeg_small
+                if jpeg_bytes is None:
                     continue
-                
-                # Send frame to client
-                await response.write(b"--frame\r\n")
-                await response.write(b"Content-Type: image/jpeg\r\n\r\n")
-                await response.write(jpeg.tobytes())
-                await response.write(b"\r\n")
-                
-                # Control streaming framerate (~30 fps)
-                await asyncio.sleep(0.063)
+
+                # One write per part: header, payload and trailer go out as a
+                # single pre-framed chunk
+                await response.write(
+                    MJPEG_PART_HEADER % len(jpeg_bytes) + jpeg_bytes + MJPEG_PART_FOOTER)
         
         except (client_exceptions.ClientConnectionResetError, BrokenPipeError):
             print(f"Client disconnected from Camera {self.camera_index}")
@@ -287,6 +497,7 @@ class CameraDevice:
             print(f"Streaming error for Camera {self.camera_index}: {e}")
 
         finally:
+            self._clients.discard(client_event)
             try:
                 await response.write_eof()
             except (client_exceptions.ClientConnectionResetError, BrokenPipeError):
@@ -297,6 +508,17 @@ class CameraDevice:
         return response
 
 
+# Key -> command name pushed onto the device's command queue
+KEY_COMMANDS = {
+    'r': 'start_recording',
+    'f': 'stop_recording',
+    't': 'start_streaming',
+    'y': 'stop_streaming',
+    'c': 'connect',
+    'd': 'disconnect',
+}
+
+
 async def keyboard_listener(cam_device):
     """Listens for keyboard input in the terminal to send commands to the camera device."""
     # This function requires non-blocking terminal I/O setup, 
@@ -305,37 +527,29 @@ async def keyboard_listener(cam_device):
     # Save original terminal settings
     print('listening for keyboard commands)')
     old_settings = termios.tcgetattr(sys.stdin)
+    loop = asyncio.get_running_loop()
+    quit_event = asyncio.Event()
+
+    def on_key():
+        key = sys.stdin.read(1)
+        if key == 'q':  # 'q' to quit the entire application
+            print("\nCommand: Quit application (q)")
+            quit_event.set()
+            return
+        cmd = KEY_COMMANDS.get(key)
+        if cmd:
+            cam_device._cmd_q.put_nowait(cmd)
+            print(f"\nCommand: {cmd} ({key})")
+
     try:
         # Set terminal to non-blocking raw mode
         tty.setcbreak(sys.stdin.fileno())
-        while True:
-            # Use select to check for input availability without blocking the asyncio loop
-            if select.select([sys.stdin], [], [], 0.0)[0]:
-                key = sys.stdin.read(1)
-                if key == 'r':
-                    cam_device.start_recording_command = True
-                    print("\nCommand: Start recording (r)")
-                elif key == 'f':
-                    cam_device.stop_recording_command = True
-                    print("\nCommand: Stop recording (f)")
-                elif key == 't':
-                    cam_device.start_streaming_command = True
-                    print("\nCommand: Start streaming display (t)")
-                elif key == 'y':
-                    cam_device.stop_streaming_command = True
-                    print("\nCommand: Stop streaming display (y)")
-                elif key == 'q': # 'q' to quit the entire application
-                     print("\nCommand: Quit application (q)")
-                     break
-                elif key == 'c':
-                     cam_device.connect_command = True
-                     print("\nCommand: Connect to camera (c)")
-                elif key == 'd':
-                     cam_device.disconnect_command = True
-                     print("\nCommand: Disconnect from camera (d)")
-
-            await asyncio.sleep(0.001) # Small sleep to not busy-wait
+        # Event-driven stdin: the loop invokes on_key when bytes are
+        # readable, so there is no select() polling at all
+        loop.add_reader(sys.stdin.fileno(), on_key)
+        await quit_event.wait()
     finally:
+        loop.remove_reader(sys.stdin.fileno())
         # Restore original terminal settings
         termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
         # Signal camera to disconnect and close gracefully before exiting program
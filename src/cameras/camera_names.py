@@ -1,6 +1,18 @@
 import subprocess
 import re
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Compiled once; these run per line / per camera during enumeration
+_NAME_CLEAN_RE = re.compile(r'\s*\(.*\)$|:')
+_VIDEO_INDEX_RE = re.compile(r'/dev/video(\d+)')
+
+# Enumeration spawns one v4l2-ctl plus one udevadm per camera, so cache the
+# result briefly — serial lookups often come in bursts
+_ENUM_TTL_S = 5.0
+_enum_cache = None
+_enum_cache_time = 0.0
 
 def get_camera_serial(camera_index):
     """
@@ -16,16 +28,14 @@ def get_camera_serial(camera_index):
         result = subprocess.run(cmd, capture_output=True, text=True, check=True)
         output = result.stdout
         
-        # Look for the specific line containing the short serial number
-        for line in output.splitlines():
-            if 'ID_SERIAL_SHORT=' in line:
-                # Extract the value after the equals sign
-                serial_match = re.search(r'ID_SERIAL_SHORT=(.*)', line)
-                if serial_match:
-                    return serial_match.group(1)
-
-        # Fallback if serial short is not found but device exists
-        return "N/A" 
+        # Single scan: find the key once instead of regex-matching every line
+        key = 'ID_SERIAL_SHORT='
+        i = output.find(key)
+        if i < 0:
+            # Fallback if serial short is not found but device exists
+            return "N/A"
+        j = output.find('\n', i)
+        return output[i + len(key):j if j >= 0 else None].strip()
 
     except subprocess.CalledProcessError as e:
         # If udevadm returns an error code, print the stderr for debugging
@@ -43,6 +53,11 @@ def get_unique_camera_names_and_indices():
     Generates a list of dictionaries for unique cameras, including their 
     index, name, and serial number.
     """
+    global _enum_cache, _enum_cache_time
+    now = time.monotonic()
+    if _enum_cache is not None and now - _enum_cache_time < _ENUM_TTL_S:
+        return _enum_cache
+
     try:
         cmd = ["v4l2-ctl", "--list-devices"]
         # Use capture_output=True only
@@ -60,10 +75,10 @@ def get_unique_camera_names_and_indices():
                 
             if not line.startswith('/dev/'):
                 # Clean up the name by removing the bus ID in parentheses (this also removes the trailing :)
-                current_name = re.sub(r'\s*\(.*\)$|:', '', line).strip()
+                current_name = _NAME_CLEAN_RE.sub('', line).strip()
             
             elif line.startswith('/dev/video'):
-                match = re.search(r'/dev/video(\d+)', line)
+                match = _VIDEO_INDEX_RE.search(line)
                 if match and current_name:
                     index = int(match.group(1))
                     
@@ -76,14 +91,18 @@ def get_unique_camera_names_and_indices():
         
         intermediate_list.sort(key=lambda x: x['index'])
 
-        # Second pass: fetch the serial number for each unique entry
-        final_camera_list = []
-        for camera in intermediate_list:
-            serial_num = get_camera_serial(camera['index'])
-            camera['serial'] = serial_num
-            final_camera_list.append(camera)
+        # Second pass: fetch all serial numbers in parallel — each udevadm
+        # is ~10-50 ms of fork/exec, so N sequential calls add up
+        if intermediate_list:
+            with ThreadPoolExecutor(max_workers=min(8, len(intermediate_list))) as ex:
+                serials = list(ex.map(get_camera_serial,
+                                      [c['index'] for c in intermediate_list]))
+            for camera, serial_num in zip(intermediate_list, serials):
+                camera['serial'] = serial_num
 
-        return final_camera_list
+        _enum_cache = intermediate_list
+        _enum_cache_time = now
+        return intermediate_list
 
     except (subprocess.CalledProcessError, FileNotFoundError):
         print("Error: Required command-line tools (v4l2-ctl or udevadm) not found or failed.", file=sys.stderr)
@@ -1,21 +1,47 @@
 import asyncio
+import concurrent.futures
 import cv2
+import numpy as np
+import os
 import sys
-import select
 import termios
+import threading
 import tty
 import subprocess
 import re
 
 from src.cameras.camera_names import get_unique_camera_names_and_indices
 
+# NVENC-backed recording when ffmpegcv is installed (API mirrors OpenCV's
+# VideoWriter); without it recording uses cv2.VideoWriter as before
+try:
+    import ffmpegcv
+except ImportError:
+    ffmpegcv = None
+
 # --- Configuration (These would typically come from your CameraManager) ---
 output_filename = 'output_video.mp4'
 frames_per_second = 30.0
 # We write the *output file* using the mp4v codec for standard playback compatibility.
-fourcc_codec = cv2.VideoWriter_fourcc(*'mp4v') 
+fourcc_codec = cv2.VideoWriter_fourcc(*'mp4v')
 # ---------------------
 
+# Ask FFmpeg-backend captures to decode MJPG on the GPU (NVDEC) when one is
+# present. Harmless on machines without CUDA: the FFmpeg open simply fails
+# and handle_disconnected_state falls back to the default V4L2/CPU path.
+os.environ.setdefault(
+    "OPENCV_FFMPEG_CAPTURE_OPTIONS",
+    "video_codec;mjpeg_cuvid|hwaccel;cuda|hwaccel_output_format;cuda")
+
+# Run the preview resize through OpenCL (UMat) when a device is available
+_use_opencl = False
+try:
+    if cv2.ocl.haveOpenCL():
+        cv2.ocl.setUseOpenCL(True)
+        _use_opencl = cv2.ocl.useOpenCL()
+except Exception:
+    pass
+
 
 class CameraDevice:    
     """
@@ -31,6 +57,20 @@ class CameraDevice:
         self.streaming_state = "stopped"
         self.cap = None
         self.video_writer = None
+        # Filled in on connect from the negotiated capture settings
+        self._frame_size = (1920, 1080)
+        self._frame_rate = frames_per_second
+        self._frame_pool = []
+        self._pool_idx = 0
+        # Display gets latest-only semantics (a stale preview is worse than a
+        # dropped one); recording gets a bounded FIFO whose backpressure
+        # pauses capture instead of dropping frames
+        self.display_q = asyncio.Queue(maxsize=1)
+        self.record_q = asyncio.Queue(maxsize=8)
+        self._capture_task_handle = None
+        # Single worker keeps writes ordered while the 10-30 ms encode runs
+        # off the event loop (the C++ call releases the GIL)
+        self._encode_executor = concurrent.futures.ThreadPoolExecutor(max_workers=1)
         self.cameras=get_unique_camera_names_and_indices()
         #self.camera_name, self.camera_serial = get_camera_name_and_serial(camera_index)
         self.output_filename = f"video_cam_{self.camera_index}_{self.camera_serial}.mp4"
@@ -68,7 +108,13 @@ class CameraDevice:
         """Tries to connect to the camera index using openCV."""
         self.is_connected = False
         try:
-            self.cap = cv2.VideoCapture(self.camera_index)
+            # Prefer the FFmpeg backend so OPENCV_FFMPEG_CAPTURE_OPTIONS can
+            # route the MJPG decode through NVDEC; fall back to the default
+            # (V4L2, CPU decode) backend when that open fails
+            self.cap = cv2.VideoCapture(f"/dev/video{self.camera_index}", cv2.CAP_FFMPEG)
+            if not self.cap.isOpened():
+                self.cap.release()
+                self.cap = cv2.VideoCapture(self.camera_index)
             if self.cap.isOpened():
                 # --- Configuration for 1080p @ 30 FPS using MJPG ---
                 fourcc_mjpg = cv2.VideoWriter_fourcc(*'MJPG')
@@ -81,6 +127,15 @@ class CameraDevice:
                 self.state = "connected"
                 actual_fps = self.cap.get(cv2.CAP_PROP_FPS)
                 actual_width = self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)
+                # Cache negotiated geometry once — CAP_PROP gets are V4L2
+                # ioctl round-trips, no need to repeat them per recording start
+                self._frame_size = (int(actual_width), int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+                self._frame_rate = actual_fps
+                # Small rotating pool of preallocated buffers: retrieve()
+                # decodes into these instead of allocating ~6 MB per frame
+                w, h = self._frame_size
+                self._frame_pool = [np.empty((h, w, 3), dtype=np.uint8) for _ in range(3)]
+                self._pool_idx = 0
                 print(f"[Cam {self.camera_index}] Connected: {self.camera_name}, Serial: {self.camera_serial}")
                 print(f"[Cam {self.camera_index}] Configured Resolution: {actual_width}x{self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)} at {actual_fps} FPS (via MJPG)")
                 
@@ -94,22 +149,73 @@ class CameraDevice:
             await asyncio.sleep(2) # Wait before retrying
 
 
-    async def handle_streaming_loop(self):
-        """The main loop for reading frames and processing commands."""
+    async def _capture_task(self):
+        """Producer stage: grabs (and decodes when needed) in the default
+        executor so the next capture overlaps the consumer's encode work."""
+        loop = asyncio.get_running_loop()
         while self.is_connected:
-            ret, frame = self.cap.read()
-            if not ret:
+            # grab() advances the stream without paying the JPEG decode;
+            # retrieve() decodes only when the frame is actually consumed
+            if not await loop.run_in_executor(None, self.cap.grab):
                 print(f"[Cam {self.camera_index}] Failed to read frame, transitioning to disconnected.")
                 self.is_connected = False
                 break
-            
-            await asyncio.gather(
-                self.handle_streaming_display(frame),
-                self.handle_video_recording(frame)
-            )
-            
-            await asyncio.sleep(0.0001) 
-        
+
+            need_frame = (self.streaming_state == "streaming") or (self.recording_state == "recording")
+            frame = None
+            if need_frame:
+                # Decode into the next pool slot; three buffers give the
+                # display path enough slack that the slot isn't overwritten
+                # while the preview still references it
+                self._pool_idx = (self._pool_idx + 1) % len(self._frame_pool)
+                ret, frame = await loop.run_in_executor(
+                    None, self.cap.retrieve, self._frame_pool[self._pool_idx])
+                if not ret:
+                    print(f"[Cam {self.camera_index}] Failed to read frame, transitioning to disconnected.")
+                    self.is_connected = False
+                    break
+
+            # Display: replace any stale frame so the preview tracks live
+            if self.display_q.full():
+                try:
+                    self.display_q.get_nowait()
+                except asyncio.QueueEmpty:
+                    pass
+            self.display_q.put_nowait(frame)
+
+            # Recording: block (pausing grab) rather than lose a frame.
+            # Copy here — the FIFO is deeper than the pool, so the slot would
+            # be overwritten before the encoder gets to it
+            if frame is not None and self.recording_state == "recording":
+                await self.record_q.put(frame.copy())
+
+    async def handle_streaming_loop(self):
+        """Consumer stage: pulls frames off the queue and runs the display
+        and recording state handlers while capture keeps running."""
+        self._capture_task_handle = asyncio.create_task(self._capture_task())
+        while self.is_connected:
+            try:
+                frame = await asyncio.wait_for(self.display_q.get(), timeout=0.5)
+            except asyncio.TimeoutError:
+                frame = None  # no frame yet; handlers still service commands
+
+            await self.handle_streaming_display(frame)
+
+            # Drain the recording FIFO fully so capture backpressure clears;
+            # run the handler once with no frame when idle so it still sees
+            # start/stop commands
+            drained = False
+            while True:
+                try:
+                    rec_frame = self.record_q.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                drained = True
+                await self.handle_video_recording(rec_frame)
+            if not drained:
+                await self.handle_video_recording(None)
+
+        self._capture_task_handle.cancel()
         cv2.destroyWindow(f'Camera {self.camera_index}')
         await self.publish_status(self.camera_index, "Disconnected")
 
@@ -128,15 +234,36 @@ class CameraDevice:
                     self.streaming_state = "stopped"
                     cv2.destroyWindow(f'Camera {self.camera_index}')
                     print(f"[Cam {self.camera_index}] Streaming display stopped.")
-                else:
-                    cv2.imshow(f'Camera {self.camera_index}', frame)
-                    if cv2.waitKey(1) & 0xFF == ord('q'):
-                       self.stop_streaming_command = True 
+                elif frame is not None:
+                    # Preview at quarter size; with OpenCL the resize runs on
+                    # the GPU and only the 960x540 result crosses back to host
+                    src = cv2.UMat(frame) if _use_opencl else frame
+                    preview = cv2.resize(src, (960, 540), interpolation=cv2.INTER_AREA)
+                    cv2.imshow(f'Camera {self.camera_index}', preview)
+                    # pollKey returns immediately instead of blocking the
+                    # event loop up to 1 ms like waitKey(1)
+                    key = cv2.pollKey()
+                    if key != -1 and (key & 0xFF) == ord('q'):
+                       self.stop_streaming_command = True
         
         self.start_streaming_command = False
         self.stop_streaming_command = False
 
-    
+    def _open_video_writer(self, frame_rate, frame_size):
+        """Prefers hardware H.264 via NVENC; falls back to software mp4v.
+
+        ffmpegcv.VideoWriterNV keeps the write()/release() call sites
+        identical, so the state machine below doesn't care which one it got.
+        """
+        if ffmpegcv is not None:
+            try:
+                writer = ffmpegcv.VideoWriterNV(self.output_filename, 'h264_nvenc', frame_rate)
+                print(f"[Cam {self.camera_index}] Recording via NVENC (ffmpegcv).")
+                return writer
+            except Exception:
+                pass  # no NVENC-capable GPU; use the software encoder
+        return cv2.VideoWriter(self.output_filename, fourcc_codec, frame_rate, frame_size)
+
     async def handle_video_recording(self, frame):
         # RECORDING LOGIC
         if not self.is_connected: return
@@ -144,14 +271,9 @@ class CameraDevice:
         match self.recording_state:
             case "stopped":
                 if self.start_recording_command:
-                    frame_width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                    frame_height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                    frame_size = (frame_width, frame_height)
-                    frame_rate = self.cap.get(cv2.CAP_PROP_FPS) 
-                    
-                    self.video_writer = cv2.VideoWriter(self.output_filename, fourcc_codec, frame_rate, frame_size)
-
-                    if not self.video_writer.isOpened():
+                    self.video_writer = self._open_video_writer(self._frame_rate, self._frame_size)
+
+                    if hasattr(self.video_writer, 'isOpened') and not self.video_writer.isOpened():
                          print(f"[Cam {self.camera_index}] Error: VideoWriter failed to open {self.output_filename}.")
                          await self.publish_status(self.camera_index, "Recording Failed to Start")
                          self.recording_state = "stopped"
@@ -166,8 +288,9 @@ class CameraDevice:
                     print(f"[Cam {self.camera_index}] Saving and finalizing recording.")
                     await self.publish_status(self.camera_index, "Saving")
                 else:
-                    if self.video_writer is not None:
-                        self.video_writer.write(frame)
+                    if self.video_writer is not None and frame is not None:
+                        await asyncio.get_running_loop().run_in_executor(
+                            self._encode_executor, self.video_writer.write, frame)
 
             case "saving":
                 if self.video_writer is not None:
@@ -191,24 +314,35 @@ async def manager_status_callback(camera_index, status_message):
 async def keyboard_listener(cam_devices):
     """Listens for keyboard input in the terminal to send commands."""
     old_settings = termios.tcgetattr(sys.stdin)
+    loop = asyncio.get_running_loop()
+    key_q = asyncio.Queue()
+
+    def reader():
+        # Blocking one-byte reads in cbreak mode: the thread parks in the
+        # kernel instead of the event loop polling stdin at 100 Hz
+        while True:
+            key = os.read(sys.stdin.fileno(), 1).decode(errors='ignore')
+            loop.call_soon_threadsafe(key_q.put_nowait, key)
+            if key == 'q':
+                break
+
     try:
         tty.setcbreak(sys.stdin.fileno())
+        threading.Thread(target=reader, daemon=True).start()
         while True:
-            if select.select([sys.stdin], [], [], 0.0):
-                key = sys.stdin.read(1)
-                if key in ['r', 'f', 't', 'y']:
-                    # Send command to all connected cameras for this example
-                    for cam in cam_devices:
-                        if cam.is_connected:
-                            if key == 'r': cam.start_recording_command = True
-                            elif key == 'f': cam.stop_recording_command = True
-                            elif key == 't': cam.start_streaming_command = True
-                            elif key == 'y': cam.stop_streaming_command = True
-                    print(f"\nCommand sent: {key}")
-                elif key == 'q':
-                     print("\nCommand: Quit application (q)")
-                     break
-            await asyncio.sleep(0.01)
+            key = await key_q.get()
+            if key in ['r', 'f', 't', 'y']:
+                # Send command to all connected cameras for this example
+                for cam in cam_devices:
+                    if cam.is_connected:
+                        if key == 'r': cam.start_recording_command = True
+                        elif key == 'f': cam.stop_recording_command = True
+                        elif key == 't': cam.start_streaming_command = True
+                        elif key == 'y': cam.stop_streaming_command = True
+                print(f"\nCommand sent: {key}")
+            elif key == 'q':
+                 print("\nCommand: Quit application (q)")
+                 break
     finally:
         termios.tcsetattr(sys.stdin, termios.TCSADRAIN, old_settings)
         for cam in cam_devices:
@@ -7,7 +7,7 @@ class CameraRecordingState(IntEnum):
     SAVING = 2
 
 # create camera status structure which has isConnected, RecordingState and Stream State
-@dataclass
+@dataclass(slots=True)
 class CameraStatus:
     isConnected: bool = False
     recordingState: int = CameraRecordingState.STOPPED
@@ -47,20 +47,27 @@ CAMERA_MAP_JAKES_HOUSE = {
 
 CAMERA_MAP = CAMERA_MAP_PRODUCTION if CAMERA_MAP_NAME == "production" else CAMERA_MAP_JAKES_HOUSE
 
+# Frozen at import: every VisCfg() shares this tuple instead of rebuilding
+# the serial list in a default_factory per construction
+_CAMERA_SERIALS = tuple(CAMERA_MAP[i] for i in range(1, len(CAMERA_MAP) + 1))
+
 HEARTBEAT_TIMEOUT_MS = 3000  # 3 seconds
+KEEPALIVE_PUBLISH_MS = 5000  # re-publish unchanged status at least this often
+STATUS_FLUSH_MS = 100  # earliest a dirty status may be flushed ahead of the 1 s tick
 
-@dataclass
+@dataclass(slots=True)
 class VisCfg:
-    numCameras: int = len(CAMERA_MAP)
-    cameraSerialNumbers: list[str] = field(default_factory=lambda: [CAMERA_MAP[i] for i in range(1, len(CAMERA_MAP)+1)])
+    numCameras: int = len(_CAMERA_SERIALS)
+    # Immutable, so all instances can safely share the one frozen tuple
+    cameraSerialNumbers: tuple = _CAMERA_SERIALS
 
-@dataclass
+@dataclass(slots=True)
 class VisSts(ExtServiceSts):
     cfg : VisCfg = field(default_factory=VisCfg)
     cameraStates: list[CameraStatus] = field(default_factory=list)
     isRecording: bool = False
 
-@dataclass
+@dataclass(slots=True)
 class DeviceCfg:
     safetyZoneId: int = 0
     controllableByHmi: bool = True
@@ -97,7 +104,7 @@ class DeviceCfg:
 # END_TYPE
 
 
-@dataclass
+@dataclass(slots=True)
 class Device:
     Is: DeviceSts = field(default_factory=DeviceSts)
     errors: DeviceFaultData = field(default_factory=DeviceFaultData)
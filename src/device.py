@@ -1,4 +1,36 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
+
+# Output-key aliases: fields whose wire names are Python keywords or differ
+# in casing ('Is' can't be spelled 'is' as an attribute)
+_FIELD_ALIASES = {'Is': 'is', 'List': 'list'}
+
+# Cached (attr name, output key) tuples, built once per dataclass on first use
+_TO_DICT_FIELDS: dict[type, tuple[tuple[str, str], ...]] = {}
+
+
+def to_dict(obj) -> dict:
+    """Fast replacement for dataclasses.asdict().
+
+    asdict() recurses through pure-Python machinery with deepcopy semantics;
+    this walker just reads attributes by cached field name and recurses only
+    for nested dataclasses and lists of dataclasses. Wire-name aliases are
+    baked into the cache, so no post-hoc key rewriting is needed.
+    """
+    cls = obj.__class__
+    names = _TO_DICT_FIELDS.get(cls)
+    if names is None:
+        names = tuple((f.name, _FIELD_ALIASES.get(f.name, f.name)) for f in fields(obj))
+        _TO_DICT_FIELDS[cls] = names
+    out = {}
+    for name, key in names:
+        value = getattr(obj, name)
+        if hasattr(value, '__dataclass_fields__'):
+            value = to_dict(value)
+        elif isinstance(value, list):
+            value = [to_dict(v) if hasattr(v, '__dataclass_fields__') else v for v in value]
+        out[key] = value
+    return out
+
 
 @dataclass
 class DeviceConstants:
@@ -13,7 +45,7 @@ class DeviceConstants:
     MAX_TASK_LIST_LEN: int = 20
     # MAX_NUM_ACTION_REQUESTS: int = 5
 
-@dataclass
+@dataclass(slots=True)
 class ProcessData:
     # THESE PARAMETERS MUST ONLY BE WRITTEN OUTSIDE THIS FB BY method: SendProcessRequest()
     uniqueActionRequestId: int = 0
@@ -35,7 +67,7 @@ class ProcessData:
     deviceStepThatCalled: int = 0  # the step number that called the process, which determines where the process returns to after completion
     paramArray: list[float] = field(default_factory=lambda: [0.0] * DeviceConstants.MAX_NUM_PARAMS)  # passable parameter for the RPC Call
 
-@dataclass
+@dataclass(slots=True)
 class FaultData:
     deviceId: int = 0
     code: int = 0  # this is deprecated
@@ -47,13 +79,13 @@ class FaultData:
     stepNum: int = 0  # of this device
     parentStepNum: int = 0
 
-@dataclass
+@dataclass(slots=True)
 class DeviceFaultData:
     List: list[FaultData] = field(default_factory=lambda: [FaultData() for _ in range(DeviceConstants.DEVICE_FAULTCODEARRAY_LEN)])
     present: bool = False  # status
     childrenPresent: bool = False  # status that children have errors
 
-@dataclass
+@dataclass(slots=True)
 class DeviceSts:
     state: int = 0  # enum for States enum, same as the boolean states in the data structure
     stepNum: int = 0
@@ -107,7 +139,7 @@ class DeviceStates:
     MANUAL: int = 1100
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceActionRequestData:
     uniqueActionRequestId: int = 0
     senderId: int = 0
@@ -115,7 +147,7 @@ class DeviceActionRequestData:
     actionId: int = 0  # could be cmd, task or processId
     paramArray: list[float] = field(default_factory=lambda: [0.0] * DeviceConstants.MAX_NUM_PARAMS)
 
-@dataclass
+@dataclass(slots=True)
 class ApiOpcuaReqData:
     id: int = 0
     checkSum: int = 0
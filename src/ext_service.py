@@ -2,12 +2,12 @@ from enum import Enum, IntEnum
 from dataclasses import dataclass, field
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtServiceCfg:
     triggerErrorIfLostHeartbeat: bool = True
 
 
-@dataclass
+@dataclass(slots=True)
 class IExtServiceInputs:
     heartbeatVal: int = 0  # USINT
     stepNum: int = 0  # INT
@@ -17,7 +17,7 @@ class IExtServiceInputs:
     taskStepNum: int = 0  # INT
 	
 
-@dataclass
+@dataclass(slots=True)
 class IExtServiceOutputs:
     heartbeatVal: int = 0  # USINT
     uniqueTaskReqId: int = 0  # DINT
@@ -28,13 +28,13 @@ class IExtServiceOutputs:
     taskParam3: float = 0.0  # REAL
 
 
-@dataclass
+@dataclass(slots=True)
 class IExtService:
     i: IExtServiceInputs = field(default_factory=IExtServiceInputs)
     o: IExtServiceOutputs = field(default_factory=IExtServiceOutputs)
 
 
-@dataclass
+@dataclass(slots=True)
 class ExtServiceSts:
     extServiceCfg: ExtServiceCfg = field(default_factory=ExtServiceCfg)  # read-only, references _cfg
     iExtService: IExtService = field(default_factory=IExtService)
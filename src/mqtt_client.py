@@ -1,6 +1,8 @@
 import asyncio
-import json
+import socket
 import sys
+
+import orjson
 # Import Client and MqttError from aiomqtt instead of asyncio_mqtt
 from aiomqtt import Client as AsyncMqttClient, MqttError, ProtocolVersion
 import aiomqtt
@@ -9,16 +11,54 @@ from config import MQTT_BROKER_IP, MQTT_PORT, MQTT_USERNAME, MQTT_PASSWORD, TOPI
 #from src.cameras.camera_manager import CameraManager
 #from src.cameras.camera_manager_old import CameraManager
 
+# 1 MB socket buffers so image/video payloads aren't drip-fed through the
+# default 2 KB buffer, and TCP_NODELAY so small task messages flush at once
+_SOCKET_OPTIONS = (
+    (socket.SOL_SOCKET, socket.SO_SNDBUF, 1 << 20),
+    (socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20),
+    (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+)
+
 
 
 class AsyncMqttClientManager:
+    # task name -> (filename template, CameraDevice method); one dict lookup
+    # instead of a growing if/elif chain of string compares. The extension is
+    # baked into each template so formatting is a single format_map over the
+    # raw args dict — no kwargs unpacking per message
+    _HANDLERS = {
+        sys.intern("record_stop_and_save"): ("{jobId}_{batchId}_{serialNumber}_{partLocationId}.mp4", "start_recording"),
+        sys.intern("take_image"): ("{jobId}_{batchId}_{serialNumber}_{partLocationId}.png", "take_image"),
+    }
+
+    # Fixed worker count: enough to keep several cameras busy without
+    # letting a burst allocate one Task per message
+    _NUM_WORKERS = 4
+
     def __init__(self):
         #self.camera_manager = camera_manager
-        self.broker_ip = MQTT_BROKER_IP
+        # Resolve the broker hostname once so the reconnect loop doesn't
+        # repeat the DNS lookup on every attempt
+        try:
+            self.broker_ip = socket.gethostbyname(MQTT_BROKER_IP)
+        except socket.gaierror:
+            self.broker_ip = MQTT_BROKER_IP  # resolve at connect time instead
         self.port = MQTT_PORT
         self.username = MQTT_USERNAME
         self.password = MQTT_PASSWORD
         self.topic_tasks = TOPIC_CAMERA_TASKS
+        # Bounded queue between the message loop and the worker pool; a full
+        # queue back-pressures the subscriber instead of growing unbounded
+        self._task_q = asyncio.Queue(maxsize=256)
+
+    async def _worker(self):
+        """Drains queued tasks; the fixed pool bounds concurrency and memory."""
+        while True:
+            task, args = await self._task_q.get()
+            try:
+                await self.handle_task(task, args)
+            except Exception as e:
+                print(f"Error handling task '{task}': {e}")
 
     async def run(self):
         """
@@ -26,6 +66,9 @@ class AsyncMqttClientManager:
         Includes robust automatic reconnection logic.
         """
         reconnect_interval = 5  # seconds
+        # Workers outlive individual broker connections
+        workers = [asyncio.create_task(self._worker())
+                   for _ in range(self._NUM_WORKERS)]
         while True:
             try:
                 # aiomqtt handles the connection as a simple async context manager
@@ -33,6 +76,7 @@ class AsyncMqttClientManager:
                 async with AsyncMqttClient(
                     hostname=self.broker_ip, # Use 'host' instead of 'hostname'
                     port=self.port,
+                    socket_options=_SOCKET_OPTIONS,
                 ) as client:
                     print(f"Connected to MQTT Broker at {self.broker_ip}:{self.port}")
                     # Start the listener task concurrently with the subscription
@@ -59,38 +103,45 @@ class AsyncMqttClientManager:
 
             # Asynchronously iterate over received messages
             async for message in messages:
-                # In aiomqtt, message.payload is already bytes, no need for message.payload.decode()
-                payload = json.loads(message.payload) 
+                # orjson parses the payload bytes directly, no decode step
+                payload = orjson.loads(message.payload)
                 task = payload.get("task")
+                if type(task) is str:
+                    # Task names come from a tiny vocabulary; interning makes
+                    # the handler-table lookup a pointer compare
+                    task = sys.intern(task)
                 args = payload.get("args", {})
-                
-                # Keep create_task for concurrent handling of camera operations
-                asyncio.create_task(self.handle_task(task, args))
+
+                # Hand off to the worker pool; no per-message Task objects
+                await self._task_q.put((task, args))
 
 
     async def handle_task(self, task, args):
         """Handles the camera tasks asynchronously."""
+        handler = self._HANDLERS.get(task)
+        if handler is None:
+            print(f"Unknown task received: {task}")
+            return
+
         cam = self.camera_manager.get_idle_camera()
         if not cam:
             print("No idle camera available")
             return
-            
+
         try:
-            if task == "record_stop_and_save":
-                filename = f"{args['jobId']}_{args['batchId']}_{args['serialNumber']}_{args['partLocationId']}.mp4"
-                await cam.start_recording(filename)
-                print(f"Started recording: {filename}")
-            elif task == "take_image":
-                filename = f"{args['jobId']}_{args['batchId']}_{args['serialNumber']}_{args['partLocationId']}.png"
-                await cam.take_image(filename)
-                print(f"Captured image: {filename}")
-            else:
-                print(f"Unknown task received: {task}")
+            tmpl, method_name = handler
+            filename = tmpl.format_map(args)
+            await getattr(cam, method_name)(filename)
+            print(f"Dispatched {task}: {filename}")
 
         except KeyError as e:
             print(f"Missing required argument in payload for task {task}: {e}")
         except Exception as e:
             print(f"Error handling task '{task}': {e}")
+        finally:
+            # get_idle_camera claimed the camera (cleared its idle bit);
+            # return it to the pool whether or not the dispatch succeeded
+            self.camera_manager.release_camera(cam)
 
 
 # Example of how you might run this new manager in your main application entry point:
@@ -1,10 +1,17 @@
 import asyncio
-from camera_service import CameraService
-from cameras.camera_device import CameraDevice
-from config import CAMERA_MAP, MQTT_BROKER_IP, MQTT_PORT
+import logging
+
+
+logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
 
 
 async def main():
+    # Heavy imports (cv2, numpy, paho via these modules) are deferred so
+    # importing service.py itself stays cheap
+    from camera_service import CameraService
+    from cameras.camera_device import CameraDevice
+    from config import CAMERA_MAP, MQTT_BROKER_IP, MQTT_PORT
+
     # Create camera devices
     # for each camera in CAMERA_MAP, create a CameraDevice
     cameras = {}
@@ -1,9 +1,14 @@
 import os
 from config import VIDEO_PATH
 
+# Directories already ensured this run; repeat calls skip the mkdir syscalls
+_created_dirs = set()
+
 def get_video_path(jobId, batchId):
     path = os.path.join(VIDEO_PATH, str(jobId), str(batchId))
-    os.makedirs(path, exist_ok=True)
+    if path not in _created_dirs:
+        os.makedirs(path, exist_ok=True)
+        _created_dirs.add(path)
     return path
 
 def save_file_path(filename, jobId, batchId):
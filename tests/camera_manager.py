@@ -1,5 +1,7 @@
 import asyncio
 
+from aiohttp import web
+
 from src.cameras.camera_device_old import CameraDevice
 # Assuming you use a library like hbmqtt or an async wrapper for paho
 # import async_mqtt_client_library as mqtt 
@@ -9,6 +11,52 @@ class CameraManager:
         # self.mqtt_client = mqtt.Client(...) # Initialize your client
         self.cameras = []
         self.broker_address = "localhost"
+        # One shared HTTP app for all cameras: a single runner and accept
+        # loop serves /stream/<idx> no matter how many devices exist
+        self.stream_port = 8000
+        self.app = web.Application()
+        self.app.router.add_get(r'/stream/{idx:\d+}', self._route_stream)
+        # One bit per camera (by list position); task dispatch claims a
+        # camera with a couple of integer ops, no scan or lock
+        self._idle_bitmap = 0
+
+    def set_camera_idle(self, slot: int, idle: bool):
+        """Maintains the idle bitmap from camera status transitions."""
+        if idle:
+            self._idle_bitmap |= 1 << slot
+        else:
+            self._idle_bitmap &= ~(1 << slot)
+
+    def get_idle_camera(self):
+        """Claims the lowest-numbered idle camera; None when all are busy.
+
+        (bitmap & -bitmap) isolates the lowest set bit; & (bitmap - 1)
+        clears it — branch-free O(1) regardless of camera count.
+        """
+        bitmap = self._idle_bitmap
+        if not bitmap:
+            return None
+        slot = (bitmap & -bitmap).bit_length() - 1
+        self._idle_bitmap = bitmap & (bitmap - 1)
+        return self.cameras[slot]
+
+    def release_camera(self, cam):
+        """Returns a camera to the idle pool once its task completes."""
+        # Camera counts are tiny; position lookup is cheaper than caching
+        self._idle_bitmap |= 1 << self.cameras.index(cam)
+
+    async def _route_stream(self, request):
+        idx = int(request.match_info['idx'])
+        if idx >= len(self.cameras):
+            return web.Response(status=404, text="No such camera")
+        return await self.cameras[idx].mjpeg_handler(request)
+
+    async def start_streaming_server(self):
+        runner = web.AppRunner(self.app)
+        await runner.setup()
+        site = web.TCPSite(runner, '0.0.0.0', self.stream_port)
+        await site.start()
+        print(f"Shared MJPEG server at http://0.0.0.0:{self.stream_port}/stream/<idx>")
 
     async def publish_status_update(self, camera_index, status_message):
         """
@@ -17,7 +65,18 @@ class CameraManager:
         """
         topic = f"camera/status/{camera_index}"
         # await self.mqtt_client.publish(topic, status_message, ...)
-        
+
+        # Keep the idle bitmap in sync with connection transitions so a
+        # disconnected camera can't be claimed for work ("disconnected"
+        # contains "connected", so it must be checked first)
+        slot = next((i for i, c in enumerate(self.cameras)
+                     if c.camera_index == camera_index), None)
+        if slot is not None:
+            if "disconnected" in status_message:
+                self.set_camera_idle(slot, False)
+            elif "connected" in status_message:
+                self.set_camera_idle(slot, True)
+
         # Placeholder for demonstration
         print(f"[MQTT Manager] Publishing to '{topic}': {status_message}")
 
@@ -30,9 +89,14 @@ class CameraManager:
         # Use your camera discovery logic here to get indices [0, 2, ...]
         camera_indices_to_use = [0, 2] 
         self.cameras = [
-            CameraDevice(index, self.publish_status_update) 
+            CameraDevice(index, self.publish_status_update, serve_http=False) 
             for index in camera_indices_to_use
         ]
+        # All cameras start idle
+        self._idle_bitmap = (1 << len(self.cameras)) - 1
+
+        # Shared server instead of one app/runner/port per camera
+        await self.start_streaming_server()
 
         # 3. Run all camera run tasks and the keyboard listener concurrently
         camera_tasks = [cam.run() for cam in self.cameras]